@@ -19,34 +19,20 @@
 # PJD 23 Aug 2022   - started
 # PJD 23 Aug 2022   - switched from clim_1990-2012 to emn (ensemble mean)
 # PJD 23 Aug 2022   - drop to single e1 ensemble member
+# PJD 18 Oct 2026   - replace wget loop with resumable, concurrent seatree.fetch
+# PJD 18 Oct 2026   - index the mirror for lazy aggregated reads (seatree.refindex)
 
 # Download generically formatted netcdf files
-date=`date +%y%m%d`
 workDir=/p/user_pub/climate_work/durack1/Shared/
 srcPath=${workDir}220809_murialdo
-# standard DAP URL
-DapURL="https://dapds00.nci.org.au/thredds/fileServer/ub7/access-s1/hc/calibrated_5km_v3/atmos/"
-# climatology path - ?
-fileURLPart="${var}/monthly/clim_1990-2012/maq5_${var}_clim${mon}${init}.nc"
-# emn path - m3aq5_rsds_19900101_emn.nc
-fileURLPart=${var}/monthly/emn/m3aq5_${var}_${year}${mon}${init}_emn.nc
+seaTreeDir=$(cd "$(dirname "$0")" && pwd)
 
-# change working dir and set output path
-cd ${srcPath}
-rm -rf ${date}
-mkdir ${date}
-cd ${date}
+# URLs are listed in seatree/manifests.py (access); the target dir is fixed, not
+# dated and not removed first, so interrupted runs resume and files already
+# downloaded and verified are skipped
+PYTHONPATH=${seaTreeDir} python3 -m seatree.fetch access --dest ${srcPath}/ACCESS-S1 --connections 4
 
-# Print for testing
-for var in {evap,pr,rsds,tasmax,tasmin,vprp_09,vprp_15,wind_speed}; do
-    for yr in {1990..2012}; do
-        for mon in {01..12}; do
-            #for init in {01,09,17,25}; do
-                filePart="${var}/monthly/emn/m3aq5_${var}_${yr}${mon}01_emn.nc"
-                url=${DapURL}${filePart}
-                echo $url
-                wget --no-check-certificate $url
-            #done
-        done
-    done
-done
+# Reference index of every file's time coverage and chunk byte offsets, open
+# a variable as one lazy series with seatree.refindex.openIndexed; unchanged
+# files are not rescanned
+PYTHONPATH=${seaTreeDir} python3 -m seatree.refindex ${srcPath}/ACCESS-S1 --pattern "m3aq5_*_emn.nc" --out ${srcPath}/ACCESS-S1/access-index.json
@@ -12,30 +12,14 @@
 
 # PJD 25 Aug 2022   - started
 # PJD 29 Aug 2022   - hacked to get 4 additional/replacement files
+# PJD 18 Oct 2026   - replace wget loop with resumable, concurrent seatree.fetch
 
 # Download generically formatted netcdf files
-date=`date +%y%m%d`
 workDir=/p/user_pub/climate_work/durack1/Shared/
 srcPath=${workDir}220809_murialdo1
-# standard DAP URL
-dapURL="http://thredds.aodn.org.au/thredds/fileServer/CSIRO/Climatology/COWCLIP2/hindcasts/Monthly"
-# monthly file - dir_CSIRO-CAWCR_monthly_1980-2014.nc
-fileURLPart=dir_${init}_1980-2014.nc
-# complete
-# http://thredds.aodn.org.au/thredds/fileServer/CSIRO/Climatology/COWCLIP2/hindcasts/Monthly/Dm/dir_CSIRO-CAWCR_monthly_1980-2014.nc
+seaTreeDir=$(cd "$(dirname "$0")" && pwd)
 
-# change working dir and set output path
-cd ${srcPath}
-rm -rf ${date}-COWCLIP2p1
-mkdir ${date}-COWCLIP2p1
-cd ${date}-COWCLIP2p1
-
-# Dm dir
-# Hs hs
-# Tm tm
-
-# Print for testing
-wget --no-check-certificate https://hpc.csiro.au/users/326141/PD_COWCLIP/CAWCR_HIST__CFSR.Hs.mlystat_from_6hly.nc
-wget --no-check-certificate https://hpc.csiro.au/users/326141/PD_COWCLIP/CAWCR_HIST__CFSR.Tm.mlystat_from_6hly.nc
-wget --no-check-certificate https://hpc.csiro.au/users/326141/PD_COWCLIP/ww3.glob_24m.hs.mlystat_from_hly.nc
-wget --no-check-certificate https://hpc.csiro.au/users/326141/PD_COWCLIP/ww3.glob_24m.t0m1.mlystat_from_hly.nc
\ No newline at end of file
+# URLs are listed in seatree/manifests.py (cowclip-claire); the target dir is fixed, not
+# dated and not removed first, so interrupted runs resume and files already
+# downloaded and verified are skipped
+PYTHONPATH=${seaTreeDir} python3 -m seatree.fetch cowclip-claire --dest ${srcPath}/COWCLIP2p1 --connections 4
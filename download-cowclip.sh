@@ -11,42 +11,15 @@
 # @author: durack1
 
 # PJD 25 Aug 2022   - started
+# PJD 18 Oct 2026   - replace wget loop with resumable, concurrent seatree.fetch
 
 # Download generically formatted netcdf files
-date=`date +%y%m%d`
 workDir=/p/user_pub/climate_work/durack1/Shared/
 srcPath=${workDir}220809_murialdo1
-# standard DAP URL
-dapURL="http://thredds.aodn.org.au/thredds/fileServer/CSIRO/Climatology/COWCLIP2/hindcasts/Monthly"
-# monthly file - dir_CSIRO-CAWCR_monthly_1980-2014.nc
-fileURLPart=dir_${init}_1980-2014.nc
-# complete
-# http://thredds.aodn.org.au/thredds/fileServer/CSIRO/Climatology/COWCLIP2/hindcasts/Monthly/Dm/dir_CSIRO-CAWCR_monthly_1980-2014.nc
+seaTreeDir=$(cd "$(dirname "$0")" && pwd)
 
-# change working dir and set output path
-cd ${srcPath}
-rm -rf ${date}-COWCLIP2p1
-mkdir ${date}-COWCLIP2p1
-cd ${date}-COWCLIP2p1
-
-# Dm dir
-# Hs hs
-# Tm tm
-
-# Print for testing
-for inst in {CSIRO-CAWCR,CSIRO-G1D,ERA5H,ERA5,ERAI,GOW1,GOW2,IORAS,JRA55-ST2,JRA55-ST4,JRC-CFDR,JRC-ERAI}; do
-    for var in {Dm,Hs,Tm}; do
-        if [ $var == "Dm" ]; then
-            filevar="dir"  # direction
-        elif [ $var == "Hs" ]; then
-            filevar="hs"  # significant wave height
-        elif [ $var == "Tm" ]; then
-            filevar="tm"  # mean wave period
-        fi
-        filePart="${filevar}_${inst}_monthly_1980-2014.nc"
-        dapVarUrl="${dapURL}/${var}/"
-        url="${dapVarUrl}${filePart}"
-        echo $url
-        wget --no-check-certificate $url
-    done
-done
+# URLs are listed in seatree/manifests.py (cowclip); the target dir is the
+# seatree.pipeline default waveData, not dated and not removed first, so
+# interrupted runs resume and files already downloaded and verified are
+# skipped
+PYTHONPATH=${seaTreeDir} python3 -m seatree.fetch cowclip --dest ${srcPath}/220825-COWCLIP2p1 --connections 4
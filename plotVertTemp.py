@@ -3,6 +3,8 @@
 """
 Created on Tue Aug  9 15:49:51 2022
 
+PJD 18 Oct 2026     - sections via seatree.transect, lazy chunked read
+
 @author: durack1
 """
 
@@ -12,6 +14,7 @@ import xcdat as xc
 #import datetime
 import os
 import matplotlib.pyplot as plt
+from seatree.transect import sampleTransects
 
 # %% data
 homeDir = '/p/user_pub/climate_work/durack1'
@@ -32,27 +35,23 @@ def fixTime(var):
 '''
 
 # %% open and read
-wH = xc.open_dataset(os.path.join(homeDir, sharedObsDir,
-                     wod18, tan), decode_times=False, add_bounds=False)
-
 # xarray preprocess notes https://github.com/pydata/xarray/issues/2313
 # https://github.com/xCDAT/xcdat/issues/304 - test example below
+# chunks={} keeps t_an lazy (dask), only the section columns are read
 wH = xc.open_dataset(os.path.join(homeDir, sharedObsDir,
-                     wod18, tan))
+                     wod18, tan), chunks={})
 
 # %% pull out longitude line
 lonX = 112.875  # 113.125  #112.875  # 113 E
 latY = np.array([-35.125, -15.125])
-t_an = wH.t_an.sel(lat=slice(-35.125, -15.125), lon=lonX, depth=slice(0, 1000))
-t_an.isel(depth=slice(None, None, -1))
-Y = abs(wH.lat.values[219:300])  # wash sign
-#X = wH.lon.values[1171]
-Z = wH.depth.values[0:47]  # 0 -> 1000 m
-# t_an.shape
-#Out[35]: (1, 102, 80)
-t_an = t_an.squeeze(axis=0)
+# sections are (lat, lon) waypoint polylines, any number can be sampled at once
+sections = [[(latY[0], lonX), (latY[1], lonX)]]
+t_an, = sampleTransects(wH.t_an, sections, depthRange=(0, 1000), spacing=0.25)
+t_an = t_an.squeeze("time").compute()
+Y = abs(t_an.lat.values)  # wash sign
+Z = t_an.depth.values  # 0 -> 1000 m
 # t_an.shape
-#Out[39]: (102, 81)
+#Out[39]: (47, 81)
 
 # %% now plot
 fig1, ax1 = plt.subplots()  # constrained_layout=True)
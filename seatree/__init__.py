@@ -0,0 +1,7 @@
+"""
+Created on Sun Oct 18 2026
+
+Shared processing routines for the SeaTree project
+
+@author: durack1
+"""
@@ -0,0 +1,92 @@
+"""
+Created on Sun Oct 18 2026
+
+Command line entry point. "run" runs pipeline stages (see
+seatree.pipeline); the other commands hand their arguments to the module
+of the same name. Only the command's own modules are imported
+
+usage: python -m seatree run [--config run.json] [--backend xarray]
+                             [--stages clim,reports] [--workers 4]
+       python -m seatree bench|fetch|refindex ...
+
+PJD 18 Oct 2026     - started
+
+@author: durack1
+"""
+
+# %% imports
+import argparse
+import importlib
+import json
+import sys
+
+# %% function defs
+
+commands = {"run": "run the wave climatology stages (seatree.pipeline)",
+            "bench": "time stages on synthetic inputs (seatree.bench)",
+            "fetch": "mirror source datasets (seatree.fetch)",
+            "refindex": "index a NetCDF4 mirror (seatree.refindex)"}
+
+
+def runMain(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m seatree run",
+        description="Run the SeaTree wave climatology stages")
+    parser.add_argument("--config", default=None,
+                        help="JSON file of seatree.pipeline.defaults keys")
+    parser.add_argument("--stages", default=None,
+                        help="comma-separated clim,reports,regrid,ensemble "
+                        "(default all)")
+    parser.add_argument("--backend", default=None, help="cdms2 or xarray")
+    parser.add_argument("--chunks", default=None,
+                        help="xarray backend dask chunks, \"auto\" or JSON "
+                        "e.g. '{\"time\": 120}'")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for institutions, regrids "
+                        "and AGCD variables")
+    parser.add_argument("--sites", default=None,
+                        help="site catalog, CSV or GeoJSON")
+    parser.add_argument("--set", action="append", default=[],
+                        metavar="KEY=JSON", help="override any config key")
+    parser.add_argument("--show-config", action="store_true",
+                        help="print the resolved config and exit")
+    args = parser.parse_args(argv)
+    overrides = {}
+    for item in args.set:
+        key, _, value = item.partition("=")
+        try:
+            overrides[key] = json.loads(value)
+        except ValueError:
+            overrides[key] = value
+    for key, value in [("backend", args.backend), ("nWorkers", args.workers),
+                       ("siteFile", args.sites)]:
+        if value is not None:
+            overrides[key] = value
+    if args.chunks is not None:
+        overrides["backendChunks"] = (args.chunks if args.chunks == "auto"
+                                      else json.loads(args.chunks))
+    from seatree.pipeline import WaveClimRun, loadConfig
+
+    config = loadConfig(args.config, **overrides)
+    if args.show_config:
+        print(json.dumps(config, indent=1, sort_keys=True))
+        return
+    stages = args.stages.split(",") if args.stages else None
+    WaveClimRun(config).run(stages)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] == "run":
+        return runMain(argv[1:])
+    if argv and argv[0] in commands:
+        return importlib.import_module("seatree." + argv[0]).main(argv[1:])
+    print("usage: python -m seatree <command> [options]\n\ncommands:")
+    for command, help in commands.items():
+        print("  %-10s %s" % (command, help))
+
+    return 0 if argv[:1] in ([], ["-h"], ["--help"]) else 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
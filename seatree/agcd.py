@@ -0,0 +1,92 @@
+"""
+Created on Sun Oct 18 2026
+
+Readers for the BoM AGCD (AWAP) climatology ESRI ASCII grids. The zipped
+monthly grids are decompressed in memory and parsed with a bulk numeric
+parser - no temporary files, chdir or external 7zz calls
+
+PJD 18 Oct 2026     - started
+PJD 18 Oct 2026     - cell-centre coordinates from xllcorner/xllcenter
+
+@author: durack1
+"""
+
+# %% imports
+import io
+import numpy as np
+import os
+import zipfile
+from seatree.trace import span
+try:
+    import zipfile_deflate64  # noqa: F401 - adds Deflate64 support if present
+except ImportError:
+    pass
+
+# %% function defs
+
+# bumped when parsed grids change, so cached parses (seatree.gridcache) are
+# not reused
+parseVersion = 2
+
+
+def parseGridAscii(raw):
+    """
+    Parse ESRI ASCII grid bytes, returning (arr, lat, lon) with nodata
+    masked and rows flipped so latitude increases with row index (same
+    orientation as the original readGridAscii). lat/lon are cell centres,
+    from either xllcorner/yllcorner (grid edge) or xllcenter/yllcenter
+    headers
+    """
+    # https://stackoverflow.com/questions/37855316/reading-grd-file-in-python
+    header = {}
+    pos = 0
+    while len(header) < 6:
+        end = raw.index(b"\n", pos)
+        key, value = raw[pos:end].split()[0:2]
+        header[key.decode().lower()] = value.decode()
+        pos = end + 1
+    ncols = int(header["ncols"])
+    nrows = int(header["nrows"])
+    cellsize = float(header["cellsize"])
+    nodata_value = float(header["nodata_value"])
+    # centre of the lower-left cell, half a cell in from the corner
+    xll = (float(header["xllcenter"]) if "xllcenter" in header
+           else float(header["xllcorner"]) + 0.5 * cellsize)
+    yll = (float(header["yllcenter"]) if "yllcenter" in header
+           else float(header["yllcorner"]) + 0.5 * cellsize)
+    lon = xll + cellsize * np.arange(ncols)
+    lat = yll + cellsize * np.arange(nrows)
+    # numpy >= 1.23 loadtxt is a C bulk parser; read from memory
+    arr = np.loadtxt(io.BytesIO(raw[pos:]), dtype=np.float64, ndmin=2)
+    if arr.shape != (nrows, ncols):
+        raise ValueError("parseGridAscii: read shape %s, expected %d x %d"
+                         % (arr.shape, nrows, ncols))
+    arr = np.flipud(arr)
+    arr = np.ma.masked_equal(arr, nodata_value)
+
+    return arr, lat, lon
+
+
+def readGridAscii(filePath):
+    """
+    Read an uncompressed ESRI ASCII grid file
+    """
+    with open(filePath, "rb") as fh:
+        return parseGridAscii(fh.read())
+
+
+def readGridAsciiZip(zipPath):
+    """
+    Read the grid member (e.g. solarjan.txt/.asc, skipping .prj projection
+    files) straight out of an AGCD zip archive in memory
+    """
+    with span("ascii", file=os.path.basename(zipPath)):
+        with zipfile.ZipFile(zipPath) as zf:
+            members = [info for info in zf.infolist() if not info.is_dir() and
+                       not info.filename.lower().endswith(".prj")]
+            if not members:
+                raise ValueError("readGridAsciiZip: no grid member in %s"
+                                 % zipPath)
+            raw = zf.read(members[0])
+
+        return parseGridAscii(raw)
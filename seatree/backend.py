@@ -0,0 +1,237 @@
+"""
+Created on Sun Oct 18 2026
+
+Pluggable file I/O for the processing stages. Stages open files through a
+backend and use the cdms2 file-variable interface they were written
+against: fh[varName], var.shape, var.attributes, var[slices] (masked at
+_FillValue/missing_value, not unpacked), and getTime/getLatitude/
+getLongitude/getLevel axes carrying units, calendar and asComponentTime.
+"cdms2" returns cdms2 handles unchanged; "xarray" wraps datasets opened
+lazily with dask chunks (NetCDF or Zarr), so each hyperslab read only
+touches the chunks it covers and decompresses them in parallel. The
+backend libraries are imported on first open
+
+PJD 18 Oct 2026     - started
+
+@author: durack1
+"""
+
+# %% imports
+import numpy as np
+import os
+
+# %% function defs
+
+defaultBackend = "cdms2"
+_axisNames = {"time": ["time", "t"],
+              "lat": ["lat", "latitude", "nav_lat", "y"],
+              "lon": ["lon", "longitude", "nav_lon", "x"],
+              "level": ["depth", "lev", "level", "plev", "z"]}
+_axisAttrs = {"time": "T", "lat": "Y", "lon": "X", "level": "Z"}
+
+
+class Axis:
+    """
+    cdms2-style axis over plain values: axis[:], units/calendar/axis
+    attributes, getBounds(), asComponentTime() and clone()
+    """
+
+    def __init__(self, values, id, bounds=None, attributes=None):
+        self.id = id
+        self._values = np.asarray(values)
+        self._bounds = None if bounds is None else np.asarray(bounds)
+        self.attributes = dict(attributes or {})
+        for att, value in self.attributes.items():
+            setattr(self, att, value)
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __len__(self):
+        return len(self._values)
+
+    @property
+    def shape(self):
+        return self._values.shape
+
+    def getBounds(self):
+        return self._bounds
+
+    def asComponentTime(self):
+        import cftime
+
+        return list(np.atleast_1d(cftime.num2date(
+            self._values, self.units, getattr(self, "calendar", "standard"))))
+
+    def clone(self):
+        return Axis(self._values.copy(), self.id, self._bounds,
+                    self.attributes)
+
+
+def monthlyTimeAxis(time, n=12):
+    """
+    The first n steps of a monthly time axis (cdms2 or Axis) with bounds
+    from the start of each month to the start of the next, as
+    cdutil.setTimeBoundsMonthly
+    """
+    import cftime
+
+    calendar = getattr(time, "calendar", "standard")
+    bounds = []
+    for comp in time.asComponentTime()[:n]:
+        year, month = comp.year, comp.month
+        start = cftime.datetime(year, month, 1, calendar=calendar)
+        end = cftime.datetime(year + month // 12, month % 12 + 1, 1,
+                              calendar=calendar)
+        bounds.append(cftime.date2num([start, end], time.units, calendar))
+    attrs = {"units": time.units, "axis": "T"}
+    if hasattr(time, "calendar"):
+        attrs["calendar"] = time.calendar
+
+    return Axis(np.asarray(time[0:n], dtype=np.float64), "time",
+                np.asarray(bounds, dtype=np.float64), attrs)
+
+
+class XarrayVariable:
+    """
+    One variable of an XarrayFile with the cdms2 file-variable interface.
+    Reads compute only the requested hyperslab of the dask array
+    """
+
+    def __init__(self, ds, varName, scheduler=None):
+        self._ds = ds
+        self._var = ds[varName]
+        self._scheduler = scheduler
+        self.id = varName
+        self.shape = self._var.shape
+        self.dtype = self._var.dtype
+        # undecoded, so _FillValue/missing_value stay in attrs
+        self.attributes = dict(self._var.attrs)
+
+    def rank(self):
+        return self._var.ndim
+
+    def __getitem__(self, key):
+        data = self._var[key].data
+        if hasattr(data, "compute"):
+            data = data.compute(scheduler=self._scheduler)
+        data = np.asarray(data)
+        mask = np.zeros(data.shape, dtype=bool)
+        for att in ["_FillValue", "missing_value"]:
+            if att in self.attributes:
+                for fill in np.atleast_1d(self.attributes[att]):
+                    mask |= data == np.asarray(fill, dtype=data.dtype)
+        if data.dtype.kind == "f":
+            mask |= np.isnan(data)
+
+        return np.ma.array(data, mask=mask)
+
+    def _axis(self, kind):
+        # dimension coordinate by axis attribute, then by name
+        for byAttr in [True, False]:
+            for dim in self._var.dims:
+                if dim not in self._ds.variables:
+                    continue
+                coord = self._ds[dim]
+                if byAttr:
+                    match = coord.attrs.get("axis") == _axisAttrs[kind]
+                else:
+                    match = dim.lower() in _axisNames[kind]
+                if match:
+                    boundsName = coord.attrs.get("bounds")
+                    bounds = None
+                    if boundsName in self._ds.variables:
+                        bounds = np.asarray(self._ds[boundsName].values)
+                    return Axis(np.asarray(coord.values), dim, bounds,
+                                coord.attrs)
+
+        return None
+
+    def getTime(self):
+        return self._axis("time")
+
+    def getLatitude(self):
+        return self._axis("lat")
+
+    def getLongitude(self):
+        return self._axis("lon")
+
+    def getLevel(self):
+        return self._axis("level")
+
+
+class XarrayFile:
+    """
+    cdms2-style file handle over a lazily opened xarray Dataset
+    """
+
+    def __init__(self, ds, scheduler=None):
+        self.ds = ds
+        self.scheduler = scheduler
+
+    def __getitem__(self, varName):
+        return XarrayVariable(self.ds, varName, self.scheduler)
+
+    def __call__(self, varName):
+        return self[varName][:]
+
+    def close(self):
+        self.ds.close()
+
+
+class CdmsBackend:
+    """
+    cdms2 files, returned as is
+    """
+    name = "cdms2"
+
+    def open(self, filePath, mode="r"):
+        import cdms2 as cdm
+
+        return cdm.open(filePath, mode)
+
+
+class XarrayBackend:
+    """
+    xarray datasets chunked with dask (chunks as for xarray.open_dataset,
+    "auto" follows the on-disk chunking), computed with the given dask
+    scheduler ("threads", "processes", "synchronous" or None for the
+    default/distributed client). Directories are opened as Zarr stores
+    """
+    name = "xarray"
+
+    def __init__(self, chunks="auto", scheduler=None):
+        self.chunks = chunks
+        self.scheduler = scheduler
+
+    def open(self, filePath, mode="r"):
+        import xarray as xr
+
+        if mode != "r":
+            raise ValueError("XarrayBackend: read only, mode %s" % mode)
+        engine = "zarr" if os.path.isdir(filePath) else None
+        # undecoded like cdms2 - fills and scale factors are handled by
+        # seatree.normalize, times stay numeric with their units
+        ds = xr.open_dataset(filePath, engine=engine, chunks=self.chunks,
+                             mask_and_scale=False, decode_times=False)
+
+        return XarrayFile(ds, self.scheduler)
+
+
+_backends = {"cdms2": CdmsBackend, "xarray": XarrayBackend}
+
+
+def getBackend(backend=None, **kwargs):
+    """
+    Backend instance from a name ("cdms2", "xarray"; None for
+    defaultBackend, kwargs passed to its constructor) or an existing
+    backend, returned as is
+    """
+    if backend is None:
+        backend = defaultBackend
+    if not isinstance(backend, str):
+        return backend
+    if backend not in _backends:
+        raise ValueError("getBackend: unknown backend %s" % backend)
+
+    return _backends[backend](**kwargs)
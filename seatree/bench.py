@@ -0,0 +1,347 @@
+"""
+Created on Sun Oct 18 2026
+
+Offline benchmark harness for the SeaTree pipeline stages. Synthetic inputs
+mirroring the real file layouts are generated at several grid sizes:
+<var>_<inst>_monthly_1980-2014.nc COWCLIP files (using the insts land
+values and scale factors), an 8x12 wave-clim product, zipped ESRI ASCII
+AGCD grids and 12 WOA18-style woa18_decav_tMM_04.nc files. Each stage is
+timed (best of --repeat) and results are written as JSON for comparison
+across changes and for scaling plots. Fixtures are written with
+netCDF4/xarray, only for the stages requested, and stage modules are
+imported when their stage runs, so the harness needs no cdms2
+
+usage: python -m seatree.bench --sizes 90x180,180x360 --out bench.json
+
+PJD 18 Oct 2026     - started
+PJD 18 Oct 2026     - --backend (cdms2/xarray) for the file-reading stages
+PJD 18 Oct 2026     - netCDF4 fixtures, stage modules imported per stage
+PJD 18 Oct 2026     - xarray backend by default, failed stages recorded
+
+@author: durack1
+"""
+
+# %% imports
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import numpy as np
+import os
+import platform
+import shutil
+import tempfile
+import time
+import zipfile
+from seatree.backend import Axis
+from seatree.climatology import statConfig
+
+# %% function defs
+
+stages = ["mask", "climatology-numpy", "climatology", "locate", "extract",
+          "woa", "ascii", "report"]
+# WOA18 standard depth levels (102)
+woaLevels = np.concatenate([np.arange(0, 100, 5), np.arange(100, 500, 25),
+                            np.arange(500, 2000, 50), np.arange(2000, 5501, 100)])
+
+
+def makeGrid(nLat, nLon):
+    # cell-centre global grid, longitudes 0-360 as COWCLIP
+    lat = -90. + (np.arange(nLat) + 0.5) * 180. / nLat
+    lon = (np.arange(nLon) + 0.5) * 360. / nLon
+
+    return lat, lon
+
+
+def landMask(lat, lon):
+    # smooth synthetic continents covering roughly a third of the globe
+    y, x = np.meshgrid(np.deg2rad(lat), np.deg2rad(lon), indexing="ij")
+
+    return np.sin(2. * x) * np.cos(3. * y) + 0.5 * np.sin(y) > 0.4
+
+
+def _axes(lat, lon, nYears=None, startYear=1980):
+    latAx = Axis(lat, "lat", attributes={"axis": "Y",
+                                         "units": "degrees_north"})
+    lonAx = Axis(lon, "lon", attributes={"axis": "X",
+                                         "units": "degrees_east"})
+    if nYears is None:
+        return latAx, lonAx
+    start = datetime.date(startYear, 1, 1)
+    days = [(datetime.date(startYear + mon // 12, mon % 12 + 1, 15) - start).days
+            for mon in range(12 * nYears)]
+    timeAx = Axis(np.array(days, dtype=np.float64), "time", attributes={
+        "axis": "T", "units": "days since %d-01-01" % startYear,
+        "calendar": "gregorian"})
+
+    return timeAx, latAx, lonAx
+
+
+def _writeNetcdf(filePath, dataVars, axes, fillValue=None):
+    # float32 variables over Axis coordinates as NetCDF4; masked values are
+    # stored as fillValue (none when None, as the COWCLIP land values)
+    import xarray as xr
+
+    dims = [axis.id for axis in axes]
+    coords = {axis.id: xr.Variable(axis.id, axis[:], axis.attributes)
+              for axis in axes}
+    ds = xr.Dataset({varName: (dims, np.ma.filled(
+        np.ma.asarray(data, dtype=np.float32), np.nan))
+        for varName, data in dataVars.items()}, coords=coords)
+    encoding = {name: {"_FillValue": None} for name in ds.variables}
+    for varName in dataVars:
+        encoding[varName] = {"dtype": "float32", "_FillValue": fillValue}
+    ds.to_netcdf(filePath, format="NETCDF4", engine="netcdf4",
+                 encoding=encoding)
+
+
+def _statValues(varId, rng, shape):
+    # plausible direction (deg), height (m) and period (s) values
+    if varId == "dir":
+        return rng.uniform(0., 360., shape)
+    elif varId == "hs":
+        return rng.gamma(2., 0.8, shape)
+    return rng.uniform(4., 14., shape)
+
+
+def writeCowclip(dataDir, inst, nLat, nLon, nYears=35, seed=0):
+    """
+    Write dir/hs/tm_<inst>_monthly_1980-2014.nc with every statistic in
+    insts[inst]; land cells hold the institution's land value and data are
+    stored divided by any scale factor
+    """
+    from seatree.cowclip import instFile, insts
+
+    rng = np.random.default_rng(seed)
+    lat, lon = makeGrid(nLat, nLon)
+    land = landMask(lat, lon)
+    axes = _axes(lat, lon, nYears)
+    for varId in insts[inst]:
+        dataVars = {}
+        for varName in insts[inst][varId]:
+            landVal, scaleFactor = statConfig(insts[inst][varId][varName])
+            data = _statValues(varId, rng, (12 * nYears, nLat, nLon))
+            data = data / scaleFactor
+            data[:, land] = landVal
+            dataVars[varName] = data
+        _writeNetcdf(instFile(varId, inst, dataDir), dataVars, axes)
+
+
+def writeWaveClim(filePath, nLat, nLon, seed=0):
+    # (stat, month, lat, lon) product as written by seatree.pipeline
+    from seatree.output import writeProduct
+
+    rng = np.random.default_rng(seed)
+    lat, lon = makeGrid(nLat, nLon)
+    timeAx, latAx, lonAx = _axes(lat, lon, 1)
+    data = np.ma.masked_where(
+        np.broadcast_to(landMask(lat, lon), (8, 12, nLat, nLon)),
+        rng.uniform(0., 10., (8, 12, nLat, nLon)).astype(np.float32))
+    writeProduct(filePath, data, timeAx, latAx, lonAx)
+
+
+def writeWoa(dataDir, nLat, nLon, seed=0):
+    # 12 monthly woa18_decav_tMM_04.nc files with t_an(time, depth, lat, lon)
+    rng = np.random.default_rng(seed)
+    lat, lon = makeGrid(nLat, nLon)
+    latAx, lonAx = _axes(lat, lon)
+    depthAx = Axis(woaLevels.astype(np.float64), "depth",
+                   attributes={"axis": "Z", "units": "meters",
+                               "positive": "down"})
+    land = landMask(lat, lon)
+    filePaths = []
+    for mon in range(1, 13):
+        timeAx = Axis(np.array([mon - 0.5]), "time", attributes={
+            "axis": "T", "units": "months since 1955-01-01 00:00:00"})
+        profile = 28. * np.exp(-woaLevels / 800.) + 2.
+        data = (profile[:, None, None] +
+                rng.normal(0., 0.5, (woaLevels.size, nLat, nLon)))[None]
+        data = np.ma.masked_where(
+            np.broadcast_to(land, data.shape), data.astype(np.float32))
+        filePath = os.path.join(dataDir, "woa18_decav_t%02d_04.nc" % mon)
+        _writeNetcdf(filePath, {"t_an": data},
+                     [timeAx, depthAx, latAx, lonAx],
+                     fillValue=np.float32(9.96921e36))
+        filePaths.append(filePath)
+
+    return filePaths
+
+
+def writeAgcdZip(filePath, nLat, nLon, seed=0):
+    # ESRI ASCII grid zipped with a .prj sidecar, as the BoM downloads
+    rng = np.random.default_rng(seed)
+    arr = np.round(rng.uniform(5., 35., (nLat, nLon)), 2)
+    # wavy west coast, ocean cells are nodata
+    lat = np.linspace(-44., -10., nLat)
+    lon = np.linspace(112., 154., nLon)
+    coast = 114. + 2. * np.sin(np.deg2rad(6. * lat))
+    arr[lon[None, :] < coast[:, None]] = -9999.
+    header = "".join(["ncols %d\n" % nLon, "nrows %d\n" % nLat,
+                      "xllcorner 112.0\n", "yllcorner -44.5\n",
+                      "cellsize 0.05\n", "NODATA_value -9999\n"])
+    body = io.StringIO()
+    np.savetxt(body, arr, fmt="%.2f")
+    with zipfile.ZipFile(filePath, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(os.path.basename(filePath).replace(".zip", ".txt"),
+                    header + body.getvalue())
+        zf.writestr(os.path.basename(filePath).replace(".zip", ".prj"),
+                    "GEOGCS[\"GCS_GDA_1994\"]")
+
+
+def bestOf(func, repeat):
+    # best wall time of repeat calls, stdout suppressed
+    times = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def runSize(workDir, nLat, nLon, nYears=35, nSites=1000, repeat=3,
+            chunkMB=512, inst="CSIRO-CAWCR", stageList=stages,
+            backend="xarray"):
+    """
+    Generate the fixtures the stages in stageList need for one grid size in
+    workDir and time each stage, reading through backend (see
+    seatree.backend), returning a list of result dicts. A stage that fails
+    (e.g. cdms2 not installed) is recorded with its error rather than
+    stopping the run
+    """
+    os.makedirs(workDir, exist_ok=True)
+    rng = np.random.default_rng(1)
+    siteLat = rng.uniform(-60., 60., nSites)
+    siteLon = rng.uniform(0., 360., nSites)
+    lat, lon = makeGrid(nLat, nLon)
+    waveFile = os.path.join(workDir, "wave-clim.nc")
+    zipFile = os.path.join(workDir, "meanjan.zip")
+    woaFiles = []
+    start = time.perf_counter()
+    if "climatology" in stageList:
+        writeCowclip(workDir, inst, nLat, nLon, nYears)
+    if "extract" in stageList:
+        writeWaveClim(waveFile, nLat, nLon)
+    if "woa" in stageList:
+        woaFiles = writeWoa(workDir, nLat, nLon)
+    if "ascii" in stageList:
+        writeAgcdZip(zipFile, nLat, nLon)
+    fixtureSeconds = time.perf_counter() - start
+    stack = None
+    if "mask" in stageList or "climatology-numpy" in stageList:
+        stack = np.random.default_rng(2).uniform(
+            0., 10., (12 * nYears, nLat, nLon)).astype(np.float32)
+        stack[:, landMask(lat, lon)] = -99.
+
+    def mask():
+        from seatree.climatology import maskScale
+
+        return maskScale(stack, -99., 0.002)
+
+    def climatologyNumpy():
+        from seatree.climatology import maskScale, monthlyClimatology
+
+        return monthlyClimatology(maskScale(stack, -99.))
+
+    def climatology():
+        from seatree.cowclip import instClimatology, insts
+
+        return instClimatology(inst, insts[inst], chunkMB * 1024**2,
+                               dataDir=workDir, backend=backend)
+
+    def locate():
+        from seatree.points import GridLocator
+
+        return GridLocator(lat, lon).nearest(siteLat, siteLon)
+
+    def extract():
+        from seatree.extract import extractSites
+
+        return extractSites([waveFile], "wave", siteLat, siteLon,
+                            backend=backend)
+
+    def woa():
+        from seatree.woa import extractWoaProfiles
+
+        return extractWoaProfiles(woaFiles, "t_an", siteLat[:10],
+                                  siteLon[:10], depths=[0, 500],
+                                  backend=backend)
+
+    def asciiGrid():
+        from seatree.agcd import readGridAsciiZip
+
+        return readGridAsciiZip(zipFile)
+
+    def report():
+        from seatree.report import writeSummary
+
+        for count in range(3):
+            writeSummary(os.path.join(workDir, "report-%d.txt" % count),
+                         "bench", "Mean",
+                         [("Ocean wave  hs_avg m,    ", np.arange(12.))] * 7)
+
+    funcs = {"mask": mask, "climatology-numpy": climatologyNumpy,
+             "climatology": climatology, "locate": locate,
+             "extract": extract, "woa": woa, "ascii": asciiGrid,
+             "report": report}
+    results = []
+    for stage in stageList:
+        result = {"stage": stage, "backend": backend, "nLat": nLat,
+                  "nLon": nLon, "nYears": nYears, "nSites": nSites,
+                  "repeat": repeat, "fixtureSeconds": fixtureSeconds}
+        try:
+            result["seconds"] = bestOf(funcs[stage], repeat)
+        except Exception as err:
+            result["seconds"] = None
+            result["error"] = "%s: %s" % (type(err).__name__, err)
+            print("%-18s %4dx%-5d failed, %s" % (stage, nLat, nLon,
+                                                   result["error"]))
+        else:
+            print("%-18s %4dx%-5d %10.4f s" % (stage, nLat, nLon,
+                                               result["seconds"]))
+        results.append(result)
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time SeaTree stages on synthetic inputs")
+    parser.add_argument("--sizes", default="45x90,90x180,180x360",
+                        help="comma-separated nLatxnLon grid sizes")
+    parser.add_argument("--years", type=int, default=35)
+    parser.add_argument("--sites", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--chunk-mb", type=int, default=512)
+    parser.add_argument("--stages", default=",".join(stages))
+    parser.add_argument("--backend", default="xarray",
+                        help="xarray or cdms2, for the file-reading stages")
+    parser.add_argument("--workdir", default=None,
+                        help="fixture directory (default temporary, removed)")
+    parser.add_argument("--out", default="bench.json")
+    args = parser.parse_args(argv)
+    workDir = args.workdir or tempfile.mkdtemp(prefix="seatree-bench-")
+    results = []
+    try:
+        for size in args.sizes.split(","):
+            nLat, nLon = [int(n) for n in size.lower().split("x")]
+            results.extend(runSize(
+                os.path.join(workDir, size), nLat, nLon, nYears=args.years,
+                nSites=args.sites, repeat=args.repeat, chunkMB=args.chunk_mb,
+                stageList=args.stages.split(","), backend=args.backend))
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workDir)
+    meta = {"created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(), "numpy": np.__version__,
+            "machine": platform.machine(), "node": platform.node(),
+            "cpus": os.cpu_count()}
+    with open(args.out, "w") as fh:
+        json.dump({"meta": meta, "results": results}, fh, indent=1)
+    print("results:", args.out)
+
+
+if __name__ == "__main__":
+    main()
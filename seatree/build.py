@@ -0,0 +1,128 @@
+"""
+Created on Sun Oct 18 2026
+
+Content-hash incremental builds. Each stage output (e.g. an institution's
+wave-clim product, its percentiles or WOA18 1x1 regrid) is keyed by the
+SHA-256 of its input files, its parameters (e.g. that institution's insts
+fill/scale entry) and the keys of the products it was built from. A JSON
+products manifest maps product names to their current key and path, so a
+stage only reruns when its key changes and downstream readers look products
+up by name rather than by a hard-coded timestamp. Input hashes are cached
+against file size and mtime so unchanged multi-GB inputs are not re-read
+
+PJD 18 Oct 2026     - started
+
+@author: durack1
+"""
+
+# %% imports
+import datetime
+import hashlib
+import json
+import os
+from seatree.gridcache import fileHash
+
+# %% function defs
+
+
+def paramHash(params):
+    """
+    SHA-256 of a JSON-serialisable parameter structure, key order ignored
+    """
+    text = json.dumps(params, sort_keys=True, default=str)
+
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _writeJson(filePath, obj):
+    # write then rename so readers never see a partial file
+    tmpPath = "%s.%d.tmp" % (filePath, os.getpid())
+    with open(tmpPath, "w") as fh:
+        json.dump(obj, fh, indent=1, sort_keys=True)
+    os.replace(tmpPath, filePath)
+
+
+class ProductStore:
+    """
+    Products manifest (buildDir/products.json) plus input hash cache
+    (buildDir/hashes). Lookups (digest, stageKey, current, path) are safe in
+    worker processes; record rewrites the manifest and should be called from
+    the parent only
+    """
+
+    def __init__(self, buildDir, manifestName="products.json"):
+        self.buildDir = buildDir
+        self.hashDir = os.path.join(buildDir, "hashes")
+        self.manifestPath = os.path.join(buildDir, manifestName)
+        os.makedirs(self.hashDir, exist_ok=True)
+        self.products = {}
+        if os.path.exists(self.manifestPath):
+            with open(self.manifestPath) as fh:
+                self.products = json.load(fh)
+
+    def digest(self, filePath):
+        """
+        Content hash of filePath, reused while its size and mtime are
+        unchanged
+        """
+        filePath = os.path.abspath(filePath)
+        stat = os.stat(filePath)
+        sidecar = os.path.join(self.hashDir, hashlib.sha1(
+            filePath.encode("utf-8")).hexdigest() + ".json")
+        if os.path.exists(sidecar):
+            with open(sidecar) as fh:
+                cached = json.load(fh)
+            if (cached["size"] == stat.st_size and
+                    cached["mtime"] == stat.st_mtime_ns):
+                return cached["sha256"]
+        sha = fileHash(filePath)
+        _writeJson(sidecar, {"path": filePath, "size": stat.st_size,
+                             "mtime": stat.st_mtime_ns, "sha256": sha})
+
+        return sha
+
+    def stageKey(self, stage, inputs=(), params=None, upstream=()):
+        """
+        Key for a stage output from its input file contents, parameters and
+        upstream product names (via their current keys)
+        """
+        parts = {"stage": stage,
+                 "inputs": [self.digest(filePath) for filePath in inputs],
+                 "params": paramHash(params),
+                 "upstream": [self.products[name]["key"] for name in upstream]}
+
+        return paramHash(parts)
+
+    def current(self, name, key):
+        """
+        Path of product name if it was built with key and still exists,
+        otherwise None
+        """
+        entry = self.products.get(name)
+        if entry is None or entry["key"] != key:
+            return None
+        if not os.path.exists(entry["path"]):
+            return None
+
+        return entry["path"]
+
+    def record(self, name, key, path, stage=None, inputs=(), params=None):
+        """
+        Register a freshly built product and rewrite the manifest
+        """
+        self.products[name] = {
+            "key": key, "path": os.path.abspath(path), "stage": stage,
+            "inputs": [os.path.abspath(filePath) for filePath in inputs],
+            "params": params,
+            "built": datetime.datetime.now().isoformat(timespec="seconds")}
+        _writeJson(self.manifestPath, self.products)
+
+    def path(self, name):
+        """
+        Path of the current product name, raising if it has not been built
+        """
+        entry = self.products.get(name)
+        if entry is None or not os.path.exists(entry["path"]):
+            raise KeyError("ProductStore: %s has not been built" % name)
+
+        return entry["path"]
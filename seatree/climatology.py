@@ -0,0 +1,125 @@
+"""
+Created on Sun Oct 18 2026
+
+Vectorized annual-cycle climatologies for stacked monthly fields. All
+statistics for an institution are held in one (stat, time, lat, lon) array
+and reduced to a (stat, 12, lat, lon) annual cycle in a single masked NumPy
+reduction, replacing per-variable cdutil.ANNUALCYCLE.climatology calls
+
+PJD 18 Oct 2026     - started
+PJD 18 Oct 2026     - add iterChunks/MonthlyClimAccumulator for bounded-memory
+                      streaming of large inputs
+PJD 18 Oct 2026     - maskScale via the fused seatree.normalize kernel,
+                      accumulator takes NaN-filled float blocks
+
+@author: durack1
+"""
+
+# %% imports
+import numpy as np
+from seatree.normalize import normalize
+
+# %% function defs
+
+
+def statConfig(instVal):
+    """
+    Split an insts entry into (landVal, scaleFactor); entries are either a
+    single land value, a [landVal, scaleFactor] pair or None (fill values
+    and scale factor taken from the file attributes, see seatree.normalize)
+    """
+    if isinstance(instVal, list):
+        return instVal[0], instVal[1]
+    return instVal, 1.
+
+
+def maskScale(arr, landVal, scaleFactor=1., lowerBound=-99.5):
+    """
+    Mask land (== landVal) and missing (< lowerBound) values and apply the
+    scale factor, equivalent to the chained MV2 masked_where calls. Returns
+    a masked float32 array (one fused pass, see seatree.normalize)
+    """
+    fills = [] if landVal is None else [landVal]
+
+    return normalize(arr, fills, scaleFactor, lowerBound=lowerBound,
+                     masked=True)
+
+
+def iterChunks(nTime, nLat, nLon, chunkBytes, nStat=1, itemSize=4):
+    """
+    Plan bounded-memory reads of a (stat, time, lat, lon) stack. Yields
+    (latSlice, timeSlices) with latitude bands outermost, sized so a block of
+    nStat x time x band x lon values fits in chunkBytes; the time axis is only
+    split (into whole-year blocks) when a single latitude row over the full
+    record is too large
+    """
+    rowBytes = nStat * nTime * nLon * itemSize
+    if rowBytes <= chunkBytes:
+        band = int(min(nLat, chunkBytes // rowBytes))
+        timeSlices = [slice(0, nTime)]
+    else:
+        band = 1
+        yearBytes = nStat * 12 * nLon * itemSize
+        step = 12 * int(max(1, chunkBytes // yearBytes))
+        timeSlices = [slice(t, min(t + step, nTime))
+                      for t in range(0, nTime, step)]
+    for lat0 in range(0, nLat, band):
+        yield slice(lat0, min(lat0 + band, nLat)), timeSlices
+
+
+class MonthlyClimAccumulator:
+    """
+    Running per-calendar-month sums and valid counts for a
+    (..., lat, lon) field, fed with (..., time, lat, lon) blocks of whole
+    years (masked, or plain float with NaN for missing values). result()
+    returns the masked (..., 12, lat, lon) climatology with
+    index 0 = January
+    """
+
+    def __init__(self, shape, firstMonth=1):
+        lead, latLon = tuple(shape[:-2]), tuple(shape[-2:])
+        self.yearAxis = len(lead)
+        self.firstMonth = firstMonth
+        self.sums = np.zeros(lead + (12,) + latLon, dtype=np.float64)
+        self.counts = np.zeros(lead + (12,) + latLon, dtype=np.int32)
+
+    def add(self, block):
+        nTime = block.shape[-3]
+        if nTime % 12:
+            raise ValueError(
+                "MonthlyClimAccumulator: block of %d months is not whole years"
+                % nTime)
+        shape = block.shape[:-3] + (nTime // 12, 12) + block.shape[-2:]
+        if np.ma.isMaskedArray(block):
+            data = np.ma.getdata(block).reshape(shape)
+            valid = ~np.ma.getmaskarray(block).reshape(shape)
+        else:
+            data = np.asarray(block).reshape(shape)
+            valid = ~np.isnan(data)
+        self.sums += np.where(valid, data, 0).sum(axis=self.yearAxis,
+                                                  dtype=np.float64)
+        self.counts += valid.sum(axis=self.yearAxis, dtype=np.int32)
+
+    def result(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            clim = np.ma.masked_where(self.counts == 0,
+                                      self.sums / self.counts)
+        # rotate so index 0 is January
+        if self.firstMonth != 1:
+            clim = np.roll(clim, self.firstMonth - 1, axis=self.yearAxis)
+
+        return clim
+
+
+def monthlyClimatology(stack, firstMonth=1):
+    """
+    Masked monthly climatology of a (..., time, lat, lon) stack of monthly
+    fields covering whole years. The time axis is reshaped to (years, 12) and
+    averaged over years in one reduction; output is (..., 12, lat, lon) with
+    index 0 = January. Cells with no valid years are masked
+    """
+    shape = stack.shape[:-3] + stack.shape[-2:]
+    acc = MonthlyClimAccumulator(shape, firstMonth=firstMonth)
+    acc.add(stack)
+
+    return acc.result()
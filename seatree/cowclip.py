@@ -0,0 +1,188 @@
+"""
+Created on Sun Oct 18 2026
+
+COWCLIP v2.1 institution configuration and the streamed 8-statistic
+monthly climatology, shared by extractWaveClim.py and seatree.bench
+
+PJD 18 Oct 2026     - started, insts/instClimatology moved from
+                      extractWaveClim.py
+PJD 18 Oct 2026     - open/read/mask/climatology spans (seatree.trace)
+PJD 18 Oct 2026     - float32 outvar (accumulation stays float64)
+PJD 18 Oct 2026     - fill values/scale from file attributes merged with
+                      insts, fused in-place normalize kernel
+PJD 18 Oct 2026     - files opened via seatree.backend (cdms2 or xarray),
+                      cdutil monthly time bounds via monthlyTimeAxis
+
+@author: durack1
+"""
+
+# %% imports
+import numpy as np
+import os
+from seatree.backend import getBackend, monthlyTimeAxis
+from seatree.climatology import MonthlyClimAccumulator, iterChunks, statConfig
+from seatree.normalize import fillConfig, normalize
+from seatree.trace import span
+
+# %% institutions
+# Per-institution land (fill) values, or [landVal, scaleFactor] pairs. These
+# are merged with each variable's _FillValue/missing_value/scale_factor
+# attributes (and the netCDF default fill), so None is enough for a member
+# whose files carry their own fill values
+insts = {
+    "CSIRO-CAWCR": {
+        "dir": {"dir_avg": 323.30010986328125, "dir_std": -99.},  # direction
+        # significant wave height
+        "hs": {"hs_avg": -99., "hs_max": [-99., 0.002], "hs_p10": -99.},
+        # mean wave period
+        "tm": {"tm_avg": -99., "tm_max": [-99., 0.01], "tm_p10": -99.},
+    },
+    "CSIRO-G1D": {
+        # direction
+        "dir": {"dir_avg": 80.99996948242188, "dir_std": 8.514225919498131e-05},
+        # significant wave height
+        "hs": {"hs_avg": -99., "hs_max": -99., "hs_p10": -99.},
+        # mean wave period
+        "tm": {"tm_avg": -99., "tm_max": -99., "tm_p10": -99.},
+    },
+    "ERA5H":  {
+        "dir": {"dir_avg": -99, "dir_std": -99.},  # direction
+        # significant wave height
+        "hs": {"hs_avg": -99., "hs_max": -99., "hs_p10": -99.},
+        # mean wave period
+        "tm": {"tm_avg": -99., "tm_max": -99., "tm_p10": -99.},
+    },
+    "ERA5":  {
+        "dir": {"dir_avg": -99, "dir_std": -99.},  # direction
+        # significant wave height
+        "hs": {"hs_avg": -99., "hs_max": -99., "hs_p10": -99.},
+        # mean wave period
+        "tm": {"tm_avg": -99., "tm_max": -99., "tm_p10": -99.},
+    },
+    "ERAI":  {
+        "dir": {"dir_avg": -99, "dir_std": -99.},  # direction
+        # significant wave height
+        "hs": {"hs_avg": -99., "hs_max": -99., "hs_p10": -99.},
+        # mean wave period
+        "tm": {"tm_avg": -99., "tm_max": -99., "tm_p10": -99.},
+    },
+    "GOW1":  {
+        "dir": {"dir_avg": -99, "dir_std": -99.},  # direction
+        # significant wave height
+        "hs": {"hs_avg": -99., "hs_max": -99., "hs_p10": -99.},
+        # mean wave period
+        "tm": {"tm_avg": -99., "tm_max": -99., "tm_p10": -99.},
+    },
+    "GOW2":  {
+        "dir": {"dir_avg": -99, "dir_std": -99.},  # direction
+        # significant wave height
+        "hs": {"hs_avg": -99., "hs_max": -99., "hs_p10": -99.},
+        # mean wave period
+        "tm": {"tm_avg": -99., "tm_max": -99., "tm_p10": -99.},
+    },
+    "IORAS":  {
+        "dir": {"dir_avg": -99, "dir_std": 9.969209968386869e+36},  # direction
+        # significant wave height
+        "hs": {"hs_avg": 9.969209968386869e+36, "hs_max": 9.969209968386869e+36, "hs_p10": -99.},
+        # mean wave period
+        "tm": {"tm_avg": -99., "tm_max": -99., "tm_p10": -99.},
+    },
+    "JRC-ERAI":  {
+        "dir": {"dir_avg": -99, "dir_std": -99.},  # direction
+        # significant wave height
+        "hs": {"hs_avg": -99., "hs_max": -99., "hs_p10": -99.},
+        # mean wave period
+        "tm": {"tm_avg": -99., "tm_max": 9.969209968386869e+36, "tm_p10": -99.},
+    },
+}
+
+# %% function defs
+
+
+def instFile(varId, inst, dataDir="."):
+    # e.g. dir_CSIRO-CAWCR_monthly_1980-2014.nc
+    return os.path.join(dataDir, "_".join([varId, inst, "monthly_1980-2014.nc"]))
+
+
+def skipReason(inst):
+    """
+    Reason an institution's inputs are missing or unusable, or None
+    """
+    if inst in ["CSIRO-G1D", "ERA5H", "ERA5"]:
+        return "no hs data, skipping.."  # doesn't include hs data
+    elif inst == "GOW2":
+        return "garbled dir info, skipping.."
+    elif inst == "IORAS":
+        return "no tm data, skipping.."
+    elif inst in ["JRA55-ST2", "JRA55-ST4"]:
+        return "dir, hs data missing, skipping.."
+    elif inst == "JRC-ERAI":
+        return "tm_max data missing, skipping.."
+    return None
+
+
+def instClimatology(inst, instVars, chunkBytes, dataDir=".", backend=None):
+    """
+    Stream every statistic for an institution through the monthly
+    climatology in latitude bands (and whole-year time blocks if needed) so
+    peak memory is set by chunkBytes rather than the grid size. Land/missing
+    values are masked and scale factors applied per block. Open, read,
+    mask/scale and climatology stages are traced per institution (and
+    statistic). Files are read through backend (a seatree.backend name or
+    instance, default cdms2). Returns (outvar, statNames, landVals, timeAx,
+    latAx, lonAx)
+    """
+    backend = getBackend(backend)
+    statNames, landVals, fileVars, fhs = [], [], [], []
+    for varId in instVars:
+        fileName = instFile(varId, inst, dataDir)
+        with span("open", inst=inst, var=varId,
+                  file=os.path.basename(fileName)):
+            fh = backend.open(fileName)
+        fhs.append(fh)
+        for varName in instVars[varId]:
+            landVal = statConfig(instVars[varId][varName])[0]
+            fills, scaleFactor, addOffset = fillConfig(
+                fh[varName], instVars[varId][varName])
+            print(varId, varName, fills, scaleFactor, addOffset)
+            statNames.append(varName)
+            landVals.append(np.nan if landVal is None else landVal)
+            fileVars.append((fh[varName], fills, scaleFactor, addOffset))
+    # coordinates for output, copied so they outlive the file handles
+    fileVar = fileVars[0][0]
+    nTime, nLat, nLon = fileVar.shape
+    time = fileVar.getTime()
+    firstMonth = time.asComponentTime()[0].month
+    timeAx = monthlyTimeAxis(time, 12)
+    latAx = fileVar.getLatitude().clone()
+    lonAx = fileVar.getLongitude().clone()
+    # Preallocate output array
+    outvar = np.ma.zeros([len(statNames), 12, nLat, nLon], dtype=np.float32)
+    outvar.mask = np.zeros(outvar.shape, dtype=bool)
+    for latSlice, timeSlices in iterChunks(nTime, nLat, nLon, chunkBytes,
+                                           nStat=len(statNames)):
+        nBand = latSlice.stop - latSlice.start
+        acc = MonthlyClimAccumulator((len(statNames), nBand, nLon),
+                                     firstMonth=firstMonth)
+        for timeSlice in timeSlices:
+            # read the hyperslab for all statistics into one float32 block,
+            # normalized in place (NaN for land/missing)
+            block = np.empty((len(statNames), timeSlice.stop -
+                              timeSlice.start, nBand, nLon), dtype=np.float32)
+            for count, (fileVar, fills, scaleFactor,
+                        addOffset) in enumerate(fileVars):
+                with span("read", inst=inst, var=statNames[count]):
+                    raw = fileVar[timeSlice, latSlice]
+                with span("mask", inst=inst, var=statNames[count]):
+                    normalize(raw, fills, scaleFactor, addOffset,
+                              out=block[count])
+            del(raw)
+            with span("climatology", inst=inst):
+                acc.add(block)
+            del(block)
+        with span("climatology", inst=inst):
+            outvar[:, :, latSlice] = acc.result()
+    for fh in fhs:
+        fh.close()
+
+    return outvar, statNames, landVals, timeAx, latAx, lonAx
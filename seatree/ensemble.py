@@ -0,0 +1,165 @@
+"""
+Created on Sun Oct 18 2026
+
+Multi-model ensemble statistics for (stat, month, lat, lon) wave-clim
+products. Members are streamed in latitude bands, so each product is read
+once and only one band of every member is held in memory, and the mean,
+spread (standard deviation), max, min and percentiles across members are
+computed per band. Direction statistics (degrees) use the circular mean and
+circular standard deviation
+
+PJD 18 Oct 2026     - started
+PJD 18 Oct 2026     - files opened via seatree.backend
+
+@author: durack1
+"""
+
+# %% imports
+import numpy as np
+from seatree.backend import getBackend
+from seatree.climatology import iterChunks
+
+# %% function defs
+
+
+def circularMean(deg, axis=0):
+    """
+    Circular mean (0-360 degrees) of a masked array of directions along
+    axis; masked where no values are valid
+    """
+    rad = np.deg2rad(np.ma.asarray(deg, dtype=np.float64))
+    mean = np.rad2deg(np.ma.arctan2(np.ma.sin(rad).mean(axis=axis),
+                                    np.ma.cos(rad).mean(axis=axis)))
+    # -0 rounds up to 360 under mod
+    mean = np.ma.mod(mean, 360.)
+
+    return np.ma.where(mean >= 360., 0., mean)
+
+
+def circularStd(deg, axis=0):
+    """
+    Circular standard deviation (degrees), sqrt(-2 ln R) with R the mean
+    resultant length, of a masked array of directions along axis
+    """
+    rad = np.deg2rad(np.ma.asarray(deg, dtype=np.float64))
+    resultant = np.ma.hypot(np.ma.sin(rad).mean(axis=axis),
+                            np.ma.cos(rad).mean(axis=axis))
+    resultant = np.ma.clip(resultant, 1e-12, 1.)
+
+    return np.rad2deg(np.ma.sqrt(-2. * np.ma.log(resultant)))
+
+
+def memberPercentiles(data, percentiles, overwrite=False):
+    """
+    Linearly interpolated percentiles (as np.nanpercentile) along axis 0 of
+    a float array with NaN for missing members, for every cell at once;
+    overwrite sorts data in place rather than a copy. Returns (nPct, ...),
+    NaN where no member is valid
+    """
+    # NaN sort last
+    if overwrite:
+        data.sort(axis=0)
+    else:
+        data = np.sort(data, axis=0)
+    count = (~np.isnan(data)).sum(axis=0)
+    out = np.full((len(percentiles),) + data.shape[1:], np.nan)
+    for ind, pct in enumerate(percentiles):
+        pos = (count - 1) * (pct / 100.)
+        lo = np.clip(np.floor(pos).astype(np.int64), 0, None)
+        hi = np.clip(np.minimum(lo + 1, count - 1), 0, None)
+        low = np.take_along_axis(data, lo[None], axis=0)[0]
+        high = np.take_along_axis(data, hi[None], axis=0)[0]
+        out[ind] = np.where(count > 0, low + (pos - lo) * (high - low),
+                            np.nan)
+
+    return out
+
+
+def bandBytes(nMembers, nPct):
+    """
+    Peak bytes per (stat, month, lat, lon) cell while a band is reduced
+    (measured with tracemalloc): the float64 + mask member block, then the
+    larger of the masked spread temporaries and, with percentiles, the
+    NaN-filled copy sorted for them plus the four statistics held and the
+    per-cell index and interpolation temporaries
+    """
+    peak = 18 * nMembers + 32
+    if nPct:
+        peak = max(peak, 8 * nMembers + 112 + 8 * nPct)
+
+    return 9 * nMembers + peak
+
+
+def reduceMembers(block, percentiles=(), dirStats=()):
+    """
+    Ensemble statistics of a masked (member, stat, ...) block. Returns a
+    dict of masked (stat, ...) mean, spread, max and min arrays and a
+    (nPct, stat, ...) pctl array. For the dirStats indices mean/spread are
+    circular and max, min and percentiles are masked
+    """
+    block = np.ma.asarray(block, dtype=np.float64)
+    out = {"mean": block.mean(axis=0), "spread": block.std(axis=0),
+           "max": block.max(axis=0), "min": block.min(axis=0)}
+    out["pctl"] = None
+    if len(percentiles):
+        # an owned NaN-filled copy, sorted in place
+        data = np.ma.getdata(block).copy()
+        data[np.ma.getmaskarray(block)] = np.nan
+        out["pctl"] = np.ma.masked_invalid(memberPercentiles(
+            data, percentiles, overwrite=True))
+        del data
+    for stat in dirStats:
+        out["mean"][stat] = circularMean(block[:, stat])
+        out["spread"][stat] = circularStd(block[:, stat])
+        for name in ["max", "min"]:
+            out[name][stat] = np.ma.masked
+        if out["pctl"] is not None:
+            out["pctl"][:, stat] = np.ma.masked
+
+    return out
+
+
+def ensembleReduce(filePaths, varName="wave", chunkBytes=512 * 1024**2,
+                   percentiles=(10, 90), dirStats=(0,), backend=None):
+    """
+    Ensemble statistics across member products (all on one grid, e.g. the
+    WOA18 1x1 regrids) of a (stat, month, lat, lon) variable, read in
+    latitude bands of at most chunkBytes across all members, statistics and
+    their temporaries (see bandBytes; through backend, a seatree.backend
+    name or instance). Returns the reduceMembers dict of full-grid
+    (stat, month, lat, lon) float32 arrays, held in addition to the band
+    """
+    backend = getBackend(backend)
+    fhs = [backend.open(filePath) for filePath in filePaths]
+    fileVars = [fh[varName] for fh in fhs]
+    nStat, nMonth, nLat, nLon = fileVars[0].shape
+    for fileVar in fileVars[1:]:
+        if fileVar.shape != fileVars[0].shape:
+            raise ValueError("ensembleReduce: member grids differ, %s vs %s"
+                             % (fileVar.shape, fileVars[0].shape))
+    out = None
+    # one band of every member, its statistics and temporaries per chunk
+    for latSlice, _ in iterChunks(nMonth, nLat, nLon, chunkBytes,
+                                  nStat=nStat,
+                                  itemSize=bandBytes(len(fileVars),
+                                                     len(percentiles))):
+        # members read one at a time into a single float64 block
+        shape = (len(fileVars), nStat, nMonth,
+                 latSlice.stop - latSlice.start, nLon)
+        block = np.ma.MaskedArray(np.empty(shape), mask=np.zeros(shape, bool))
+        for member, fileVar in enumerate(fileVars):
+            block[member] = fileVar[:, :, latSlice]
+        band = reduceMembers(block, percentiles, dirStats)
+        if out is None:
+            out = {name: None if band[name] is None else np.ma.masked_all(
+                band[name].shape[:-2] + (nLat, nLon), dtype=np.float32)
+                for name in band}
+        for name in band:
+            if band[name] is not None:
+                out[name][..., latSlice, :] = band[name]
+        # released before the next band is read
+        del block, band
+    for fh in fhs:
+        fh.close()
+
+    return out
@@ -0,0 +1,69 @@
+"""
+Created on Sun Oct 18 2026
+
+Open-once point extraction from gridded products. Each file is opened a
+single time and only the hyperslab covering the requested sites is read,
+returning every leading (e.g. statistic x month) value for all sites and
+files in one array
+
+PJD 18 Oct 2026     - started
+PJD 18 Oct 2026     - files opened via seatree.backend
+
+@author: durack1
+"""
+
+# %% imports
+import numpy as np
+import os
+from seatree.backend import getBackend
+from seatree.points import getLocator
+from seatree.trace import span
+
+# %% function defs
+
+
+def readSites(fileVar, latInd, lonInd, lead=None, maxBoxFactor=64):
+    """
+    Read (..., nSites) values from a file variable at grid indices.
+    lead optionally restricts the leading (e.g. time, depth) dimensions with
+    slices. Sites are read from their bounding lat/lon box in one hyperslab
+    unless that box is more than maxBoxFactor times the number of sites, in
+    which case each distinct column is read individually
+    """
+    if lead is None:
+        lead = (slice(None),) * (fileVar.rank() - 2)
+    lead = tuple(lead)
+    lat0, lat1 = int(latInd.min()), int(latInd.max()) + 1
+    lon0, lon1 = int(lonInd.min()), int(lonInd.max()) + 1
+    if (lat1 - lat0) * (lon1 - lon0) <= maxBoxFactor * latInd.size:
+        box = fileVar[lead + (slice(lat0, lat1), slice(lon0, lon1))]
+        return np.ma.asarray(box)[..., latInd - lat0, lonInd - lon0]
+    cells, inverse = np.unique(np.stack([latInd, lonInd], axis=-1), axis=0,
+                               return_inverse=True)
+    columns = [np.ma.asarray(fileVar[lead + (slice(i, i + 1),
+                                             slice(j, j + 1))])[..., 0, 0]
+               for i, j in cells]
+
+    return np.ma.stack(columns, axis=-1)[..., inverse.ravel()]
+
+
+def extractSites(filePaths, varName, siteLat, siteLon, backend=None):
+    """
+    Nearest-cell values of varName at all sites for each file, returned as
+    a masked (nFiles, ..., nSites) array. Each file is opened once and only
+    the hyperslab covering the sites is read (through backend, a
+    seatree.backend name or instance)
+    """
+    backend = getBackend(backend)
+    out = []
+    for filePath in filePaths:
+        with span("extract", var=varName, file=os.path.basename(filePath)):
+            fh = backend.open(filePath)
+            fileVar = fh[varName]
+            locator = getLocator(fileVar.getLatitude()[:],
+                                 fileVar.getLongitude()[:])
+            latInd, lonInd = locator.nearest(siteLat, siteLon)
+            out.append(readSites(fileVar, latInd, lonInd))
+            fh.close()
+
+    return np.ma.stack(out)
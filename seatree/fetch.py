@@ -0,0 +1,191 @@
+"""
+Created on Sun Oct 18 2026
+
+Concurrent, resumable downloader driven by the dataset manifests in
+seatree.manifests. Files are fetched over a bounded number of connections,
+partial downloads (.part) resume with HTTP Range requests, sizes and
+optional SHA-256 checksums are verified, and files already present and
+verified are skipped. Verified sizes/checksums are recorded in
+<destDir>/.fetch-state.json so later runs can skip without re-hashing
+
+usage: python -m seatree.fetch {cowclip,cowclip-claire,agcd,access,<manifest.json>}
+                               --dest DIR [--connections N]
+
+PJD 18 Oct 2026     - started
+
+@author: durack1
+"""
+
+# %% imports
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+import re
+import ssl
+import threading
+import urllib.error
+import urllib.request
+from seatree.manifests import loadManifest
+
+# %% function defs
+
+stateName = ".fetch-state.json"
+
+
+def sha256File(path, blockSize=1024**2):
+    sha = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(blockSize), b""):
+            sha.update(block)
+
+    return sha.hexdigest()
+
+
+def isComplete(path, entry, state):
+    """
+    True if path exists and matches the manifest (or recorded) size/sha256
+    """
+    if not os.path.exists(path):
+        return False
+    known = state.get(entry["path"], {})
+    size = entry.get("size", known.get("size"))
+    if size is not None and os.path.getsize(path) != size:
+        return False
+    if "sha256" in entry and entry["sha256"] != known.get("sha256"):
+        return sha256File(path) == entry["sha256"]
+
+    return True
+
+
+def fetchFile(entry, destDir, state, context=None, timeout=60, retries=3,
+              blockSize=1024**2):
+    """
+    Download one manifest entry into destDir, resuming any .part file.
+    Returns (status, info) with status "skipped" or "fetched" and info the
+    verified {"size", "sha256"}; raises once retries are exhausted or
+    verification keeps failing
+    """
+    path = os.path.join(destDir, entry["path"])
+    if isComplete(path, entry, state):
+        return "skipped", None
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    part = path + ".part"
+    for attempt in range(retries):
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        headers = dict(entry.get("headers", {}))
+        if offset:
+            headers["Range"] = "bytes=%d-" % offset
+        request = urllib.request.Request(entry["url"], headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=timeout,
+                                        context=context) as resp:
+                total = None
+                if resp.status == 206:
+                    match = re.match(r"bytes (\d+)-\d+/(\d+|\*)",
+                                     resp.headers.get("Content-Range", ""))
+                    if not match or int(match.group(1)) != offset:
+                        raise IOError("bad Content-Range for %s" % entry["url"])
+                    if match.group(2) != "*":
+                        total = int(match.group(2))
+                    mode = "ab"
+                else:
+                    # server ignored the range, start over
+                    offset = 0
+                    mode = "wb"
+                    if resp.headers.get("Content-Length"):
+                        total = int(resp.headers["Content-Length"])
+                with open(part, mode) as fh:
+                    for block in iter(lambda: resp.read(blockSize), b""):
+                        fh.write(block)
+        except urllib.error.HTTPError as err:
+            if err.code != 416:  # 416 - part already holds the whole file
+                if err.code < 500 or attempt == retries - 1:
+                    raise
+                continue
+            total = offset
+        except (urllib.error.URLError, OSError):
+            if attempt == retries - 1:
+                raise
+            continue
+        # verify then move into place
+        size = os.path.getsize(part)
+        expected = entry.get("size", total)
+        if expected is not None and size != expected:
+            if size > expected:
+                os.remove(part)
+            continue
+        digest = sha256File(part)
+        if "sha256" in entry and digest != entry["sha256"]:
+            os.remove(part)
+            continue
+        os.replace(part, path)
+        return "fetched", {"size": size, "sha256": digest}
+    raise IOError("fetchFile: %s failed verification after %d attempts"
+                  % (entry["url"], retries))
+
+
+def fetchManifest(manifest, destDir, nConnections=4, verifySSL=False,
+                  timeout=60, retries=3):
+    """
+    Fetch every manifest entry into destDir using at most nConnections
+    concurrent downloads. Returns {path: status} with status "skipped",
+    "fetched" or the error message
+    """
+    os.makedirs(destDir, exist_ok=True)
+    statePath = os.path.join(destDir, stateName)
+    state = {}
+    if os.path.exists(statePath):
+        with open(statePath) as fh:
+            state = json.load(fh)
+    context = None
+    if not verifySSL:  # as wget --no-check-certificate
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    lock = threading.Lock()
+
+    def worker(entry):
+        try:
+            status, info = fetchFile(entry, destDir, state, context=context,
+                                     timeout=timeout, retries=retries)
+        except Exception as err:
+            status, info = "failed: %s" % err, None
+        with lock:
+            if info is not None:
+                state[entry["path"]] = info
+                with open(statePath + ".tmp", "w") as fh:
+                    json.dump(state, fh, indent=1)
+                os.replace(statePath + ".tmp", statePath)
+            print(status.split(":")[0] + ":", entry["url"])
+        return entry["path"], status
+
+    with ThreadPoolExecutor(max_workers=nConnections) as pool:
+        results = dict(pool.map(worker, manifest))
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Fetch a SeaTree dataset manifest")
+    parser.add_argument("manifest",
+                        help="dataset name or manifest JSON file")
+    parser.add_argument("--dest", required=True, help="target directory")
+    parser.add_argument("--connections", type=int, default=4,
+                        help="concurrent downloads (default 4)")
+    parser.add_argument("--verify-ssl", action="store_true",
+                        help="check server certificates")
+    args = parser.parse_args(argv)
+    results = fetchManifest(loadManifest(args.manifest), args.dest,
+                            nConnections=args.connections,
+                            verifySSL=args.verify_ssl)
+    failed = [path for path in results if results[path].startswith("failed")]
+    print("fetched/skipped:", len(results) - len(failed), "failed:", len(failed))
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,143 @@
+"""
+Created on Sun Oct 18 2026
+
+Persistent on-disk cache of parsed AGCD grids. Each grid is stored as a
+float64 .npy array (already flipped to the readGridAscii orientation, NaN
+where nodata) plus a small JSON sidecar holding lat/lon, keyed by the
+SHA-256 of the source zip and the parser version. Cached grids are returned
+as read-only np.load(mmap_mode="r") maps with no mask to build, so a read
+only touches the pages of the cells it samples; entries are evicted
+least-recently-used once the cache exceeds maxBytes
+
+PJD 18 Oct 2026     - started
+PJD 18 Oct 2026     - keys include seatree.agcd.parseVersion
+PJD 18 Oct 2026     - NaN-filled grids returned as bare memory maps
+
+@author: durack1
+"""
+
+# %% imports
+import hashlib
+import json
+import numpy as np
+import os
+from seatree.agcd import parseVersion, readGridAsciiZip
+from seatree.trace import span
+
+# %% function defs
+
+
+def fileHash(filePath, blockSize=1024**2):
+    """
+    SHA-256 hex digest of a file's contents
+    """
+    sha = hashlib.sha256()
+    with open(filePath, "rb") as fh:
+        for block in iter(lambda: fh.read(blockSize), b""):
+            sha.update(block)
+
+    return sha.hexdigest()
+
+
+class GridCache:
+    """
+    Size-capped LRU cache of parsed grids, see module docstring
+    """
+
+    def __init__(self, cacheDir, maxBytes=4 * 1024**3):
+        self.cacheDir = cacheDir
+        self.maxBytes = maxBytes
+        os.makedirs(cacheDir, exist_ok=True)
+
+    def _paths(self, key):
+        base = os.path.join(self.cacheDir, key)
+        return base + ".npy", base + ".json"
+
+    def get(self, key):
+        """
+        Return (data, lat, lon) for a cached key, or None. data is a
+        read-only memory map of the cached grid, NaN where nodata
+        """
+        dataPath, metaPath = self._paths(key)
+        if not (os.path.exists(dataPath) and os.path.exists(metaPath)):
+            return None
+        with open(metaPath) as fh:
+            meta = json.load(fh)
+        if meta.get("missing") != "nan":
+            return None  # nodata-filled entry from an older cache, reparsed
+        data = np.load(dataPath, mmap_mode="r")
+        # mark as recently used
+        os.utime(dataPath)
+
+        return data, np.array(meta["lat"]), np.array(meta["lon"])
+
+    def put(self, key, arr, lat, lon, source=None):
+        """
+        Store a parsed (flipud, nodata-masked) grid, masked cells as NaN,
+        and evict old entries
+        """
+        dataPath, metaPath = self._paths(key)
+        meta = {"source": source, "missing": "nan", "flipud": True,
+                "lat": np.asarray(lat).tolist(),
+                "lon": np.asarray(lon).tolist()}
+        # write to temporaries then rename so readers never see partial files
+        tmpData = dataPath + ".tmp.npy"
+        np.save(tmpData, np.ma.filled(np.ma.asarray(arr, dtype=np.float64),
+                                      np.nan))
+        with open(metaPath + ".tmp", "w") as fh:
+            json.dump(meta, fh)
+        os.replace(tmpData, dataPath)
+        os.replace(metaPath + ".tmp", metaPath)
+        self.evict(keep=key)
+
+    def evict(self, keep=None):
+        """
+        Remove least-recently-used entries until the cache fits maxBytes
+        """
+        entries = []
+        for fileName in os.listdir(self.cacheDir):
+            if not fileName.endswith(".npy") or ".tmp" in fileName:
+                continue
+            key = fileName[:-4]
+            dataPath, metaPath = self._paths(key)
+            size = os.path.getsize(dataPath)
+            if os.path.exists(metaPath):
+                size = size + os.path.getsize(metaPath)
+            entries.append((os.path.getmtime(dataPath), size, key))
+        total = sum(entry[1] for entry in entries)
+        for mtime, size, key in sorted(entries):
+            if total <= self.maxBytes:
+                break
+            if key == keep:
+                continue
+            for path in self._paths(key):
+                if os.path.exists(path):
+                    os.remove(path)
+            total = total - size
+
+    def zipKey(self, zipPath):
+        """
+        Cache key of a zip: the SHA-256 of its contents and the parser
+        version
+        """
+        return "%s-v%d" % (fileHash(zipPath), parseVersion)
+
+    def readGridAsciiZip(self, zipPath, key=None):
+        """
+        Cached equivalent of seatree.agcd.readGridAsciiZip, returning the
+        get() memory map (NaN where nodata) rather than a masked array. key,
+        if already resolved with zipKey (e.g. by a parent process), skips
+        hashing the zip, so a cached grid is mapped without reading the zip
+        at all
+        """
+        with span("ascii-cache", file=os.path.basename(zipPath)) as record:
+            if key is None:
+                key = self.zipKey(zipPath)
+            cached = self.get(key)
+            record["hit"] = cached is not None
+            if cached is not None:
+                return cached
+            arr, lat, lon = readGridAsciiZip(zipPath)
+            self.put(key, arr, lat, lon, source=os.path.basename(zipPath))
+
+            return self.get(key)
@@ -0,0 +1,109 @@
+"""
+Created on Sun Oct 18 2026
+
+Dataset manifests for seatree.fetch, replacing the URL loops in the
+download-*.sh scripts. Each manifest is a list of entries
+{"url": ..., "path": ...} with optional "size" (bytes) and "sha256" used
+for verification; manifests can also be saved/loaded as JSON
+
+PJD 18 Oct 2026     - started
+
+@author: durack1
+"""
+
+# %% imports
+import json
+
+# %% function defs
+
+cowclipURL = "http://thredds.aodn.org.au/thredds/fileServer/CSIRO/Climatology/COWCLIP2/hindcasts/Monthly"
+cowclipInsts = ["CSIRO-CAWCR", "CSIRO-G1D", "ERA5H", "ERA5", "ERAI", "GOW1",
+                "GOW2", "IORAS", "JRA55-ST2", "JRA55-ST4", "JRC-CFDR",
+                "JRC-ERAI"]
+agcdURL = "http://www.bom.gov.au/web01/ncc/www/climatology"
+accessURL = "https://dapds00.nci.org.au/thredds/fileServer/ub7/access-s1/hc/calibrated_5km_v3/atmos/"
+claireURL = "https://hpc.csiro.au/users/326141/PD_COWCLIP/"
+# BoM rejects the default urllib/wget user agent
+browserAgent = "Mozilla/5.0 (X11; Linux x86_64; rv:30.0) Gecko/20100101 Firefox/30.0"
+
+
+def cowclipManifest(insts=cowclipInsts):
+    # COWCLIP v2.1 monthly hindcasts, Dm/Hs/Tm -> dir/hs/tm
+    manifest = []
+    for inst in insts:
+        for var, fileVar in [("Dm", "dir"), ("Hs", "hs"), ("Tm", "tm")]:
+            filePart = "_".join([fileVar, inst, "monthly_1980-2014.nc"])
+            manifest.append({"url": "/".join([cowclipURL, var, filePart]),
+                             "path": filePart})
+
+    return manifest
+
+
+def cowclipClaireManifest():
+    # additional/replacement CSIRO COWCLIP files
+    files = ["CAWCR_HIST__CFSR.Hs.mlystat_from_6hly.nc",
+             "CAWCR_HIST__CFSR.Tm.mlystat_from_6hly.nc",
+             "ww3.glob_24m.hs.mlystat_from_hly.nc",
+             "ww3.glob_24m.t0m1.mlystat_from_hly.nc"]
+
+    return [{"url": claireURL + fileName, "path": fileName}
+            for fileName in files]
+
+
+def agcdManifest():
+    # BoM AGCD v1 gridded climatology zips
+    dirVars = {"solar": "solar_radiation",
+               "rh09": "relative-humidity/rh09",
+               "rh15": "relative-humidity/rh15",
+               "mean": "temperature/mean",
+               "mnt": "temperature/mnt",
+               "mxt": "temperature/mxt"}
+    mons = ["jan", "feb", "mar", "apr", "may", "jun",
+            "jul", "aug", "sep", "oct", "nov", "dec"]
+    manifest = []
+    for mon in mons:
+        for var in dirVars:
+            filePart = "".join([var, mon, ".zip"])
+            manifest.append({"url": "/".join([agcdURL, dirVars[var], filePart]),
+                             "path": filePart,
+                             "headers": {"User-Agent": browserAgent}})
+
+    return manifest
+
+
+def accessManifest(years=range(1990, 2013)):
+    # ACCESS-S1 calibrated 5 km ensemble-mean monthly hindcasts
+    manifest = []
+    for var in ["evap", "pr", "rsds", "tasmax", "tasmin", "vprp_09",
+                "vprp_15", "wind_speed"]:
+        for year in years:
+            for mon in range(1, 13):
+                fileName = "m3aq5_%s_%d%02d01_emn.nc" % (var, year, mon)
+                manifest.append({
+                    "url": "".join([accessURL, var, "/monthly/emn/", fileName]),
+                    "path": fileName})
+
+    return manifest
+
+
+datasets = {
+    "cowclip": cowclipManifest,
+    "cowclip-claire": cowclipClaireManifest,
+    "agcd": agcdManifest,
+    "access": accessManifest,
+}
+
+
+def loadManifest(nameOrPath):
+    """
+    Return a named dataset manifest, or load one from a JSON file
+    """
+    if nameOrPath in datasets:
+        return datasets[nameOrPath]()
+    with open(nameOrPath) as fh:
+        return json.load(fh)
+
+
+def saveManifest(manifest, path):
+    with open(path, "w") as fh:
+        json.dump(manifest, fh, indent=1)
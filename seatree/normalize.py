@@ -0,0 +1,79 @@
+"""
+Created on Sun Oct 18 2026
+
+Fused mask/fill/scale normalization. Fill values and packing are read from
+each variable's _FillValue, missing_value, scale_factor and add_offset
+attributes (the netCDF default float fill is always treated as missing) and
+merged with per-institution insts overrides. Masking and scaling are then
+applied in one pass over a float32 buffer, replacing the chained
+masked_where calls and their full-size temporaries
+
+PJD 18 Oct 2026     - started
+
+@author: durack1
+"""
+
+# %% imports
+import numpy as np
+
+# %% function defs
+
+ncDefaultFill = 9.969209968386869e+36
+
+
+def fillConfig(fileVar, instVal=None):
+    """
+    (fills, scaleFactor, addOffset) for a cdms2 file variable (or a dict of
+    its attributes). instVal is an insts entry - a land value, a
+    [landVal, scaleFactor] pair or None - whose land value is added to the
+    fill values and whose scale factor, if given, replaces scale_factor
+    """
+    attrs = getattr(fileVar, "attributes", fileVar)
+    fills = [ncDefaultFill]
+    for att in ["_FillValue", "missing_value"]:
+        if att in attrs:
+            fills.extend(np.atleast_1d(attrs[att]).astype(np.float64).tolist())
+    scaleFactor = float(attrs.get("scale_factor", 1.))
+    addOffset = float(attrs.get("add_offset", 0.))
+    if isinstance(instVal, list):
+        fills.append(float(instVal[0]))
+        scaleFactor = float(instVal[1])
+    elif instVal is not None:
+        fills.append(float(instVal))
+
+    return sorted(set(fills)), scaleFactor, addOffset
+
+
+def normalize(arr, fills=(), scaleFactor=1., addOffset=0., lowerBound=-99.5,
+              out=None, masked=False):
+    """
+    Mask values equal to any fill, below lowerBound (None to disable) or
+    already masked, then apply scaleFactor and addOffset. Values are copied
+    (or cast) once into out, a float32 buffer that may be a view into a
+    larger block, and everything else happens in place. Returns out with
+    NaN at missing values, or a masked array over it when masked is True
+    """
+    data = np.ma.getdata(arr)
+    if out is None:
+        out = np.empty(data.shape, dtype=np.float32)
+    if out is not data:
+        out[...] = data
+    if lowerBound is not None:
+        bad = np.less(out, lowerBound)
+    else:
+        bad = np.zeros(out.shape, dtype=bool)
+    hit = np.empty(out.shape, dtype=bool)
+    for fill in fills:
+        np.logical_or(bad, np.equal(out, np.float32(fill), out=hit), out=bad)
+    mask = np.ma.getmask(arr)
+    if mask is not np.ma.nomask:
+        np.logical_or(bad, mask, out=bad)
+    if scaleFactor != 1.:
+        np.multiply(out, np.float32(scaleFactor), out=out)
+    if addOffset != 0.:
+        np.add(out, np.float32(addOffset), out=out)
+    out[bad] = np.nan
+    if masked:
+        return np.ma.array(out, mask=bad, copy=False)
+
+    return out
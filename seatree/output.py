@@ -0,0 +1,103 @@
+"""
+Created on Sun Oct 18 2026
+
+Float32 product writer with chunking tuned for point access. (stat, month,
+lat, lon) products are written as NetCDF4 (zlib + shuffle) or Zarr with
+chunks spanning every leading (stat x month) value but only a small lat/lon
+tile, so the full annual cycle of all statistics at a site is one chunk
+(8x12x8x8 float32 is 24 KiB before compression) rather than whole grids
+
+PJD 18 Oct 2026     - started
+PJD 18 Oct 2026     - xarray imported on first write
+
+@author: durack1
+"""
+
+# %% imports
+import numpy as np
+import os
+
+# %% function defs
+
+fillValue = np.float32(1e20)
+
+
+def chunkShape(shape, pointChunk=(8, 8)):
+    """
+    Chunks covering all leading dimensions and at most a pointChunk
+    lat/lon tile
+    """
+    return tuple(shape[:-2]) + tuple(min(size, chunk) for size, chunk in
+                                     zip(shape[-2:], pointChunk))
+
+
+def _coord(axis, name):
+    # numeric values and CF attributes of a cdms2 axis (or plain array)
+    import xarray as xr
+
+    values = np.asarray(axis[:])
+    attrs = {}
+    for att in ["units", "calendar", "axis", "standard_name", "long_name"]:
+        if hasattr(axis, att):
+            attrs[att] = getattr(axis, att)
+    attrs.setdefault("axis", {"time": "T", "lat": "Y", "lon": "X"}.get(name))
+    if attrs["axis"] is None:
+        del attrs["axis"]
+
+    return xr.Variable(name, values, attrs)
+
+
+def productDataset(data, timeAx, latAx, lonAx, varName="wave",
+                   statNames=None, attrs=None):
+    """
+    xarray Dataset for a masked (stat, time, lat, lon) array; masked values
+    become NaN and data are float32
+    """
+    import xarray as xr
+
+    data = np.ma.filled(np.ma.asarray(data, dtype=np.float32), np.nan)
+    coords = {"stat": xr.Variable("stat", np.arange(data.shape[0],
+                                                    dtype=np.int32)),
+              "time": _coord(timeAx, "time"),
+              "lat": _coord(latAx, "lat"),
+              "lon": _coord(lonAx, "lon")}
+    if statNames is not None:
+        coords["stat"].attrs["names"] = " ".join(statNames)
+    getBounds = getattr(timeAx, "getBounds", None)
+    bounds = getBounds() if getBounds is not None else None
+    dataVars = {varName: (("stat", "time", "lat", "lon"), data)}
+    if bounds is not None:
+        coords["time"].attrs["bounds"] = "time_bnds"
+        dataVars["time_bnds"] = (("time", "bnds"), np.asarray(bounds))
+
+    return xr.Dataset(dataVars, coords=coords, attrs=attrs or {})
+
+
+def writeProduct(outName, data, timeAx, latAx, lonAx, varName="wave",
+                 fmt="netcdf4", pointChunk=(8, 8), complevel=4,
+                 statNames=None, attrs=None):
+    """
+    Write a float32 (stat, month, lat, lon) product, replacing any existing
+    file. fmt "netcdf4" writes zlib/shuffle compressed chunks, "zarr" a
+    Zarr store (zarr must be installed), both chunked by chunkShape
+    """
+    ds = productDataset(data, timeAx, latAx, lonAx, varName=varName,
+                        statNames=statNames, attrs=attrs)
+    chunks = chunkShape(ds[varName].shape, pointChunk)
+    # no fill values on coordinates
+    encoding = {name: {"_FillValue": None} for name in ds.variables
+                if name != varName}
+    if fmt == "netcdf4":
+        if os.path.isfile(outName):
+            os.remove(outName)
+        encoding[varName] = {"dtype": "float32", "zlib": complevel > 0,
+                             "complevel": complevel, "shuffle": True,
+                             "chunksizes": chunks, "_FillValue": fillValue}
+        ds.to_netcdf(outName, format="NETCDF4", engine="netcdf4",
+                     encoding=encoding)
+    elif fmt == "zarr":
+        encoding[varName] = {"dtype": "float32", "chunks": chunks,
+                             "_FillValue": fillValue}
+        ds.to_zarr(outName, mode="w", encoding=encoding)
+    else:
+        raise ValueError("writeProduct: unknown format %s" % fmt)
@@ -0,0 +1,80 @@
+"""
+Created on Sun Oct 18 2026
+
+Process-pool helpers for running independent per-institution (or per-file)
+work concurrently while keeping logs and results in a fixed input order
+
+PJD 18 Oct 2026     - started
+PJD 18 Oct 2026     - merge worker trace spans
+PJD 18 Oct 2026     - synchronous dask scheduler in workers
+
+@author: durack1
+"""
+
+# %% imports
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import io
+import multiprocessing as mp
+import sys
+from seatree.trace import tracer
+
+# %% function defs
+
+
+def _initWorker():
+    # A forked worker inherits the parent's dask thread pool object but not
+    # its threads, so computing on it would wait forever; each worker is
+    # already one of nWorkers processes, so compute in the calling thread
+    if "dask" in sys.modules:
+        import dask
+
+        dask.config.set(scheduler="synchronous")
+
+
+def _captured(func, item):
+    # Run func in a worker, collecting anything it prints (and any trace
+    # spans it records) so the parent can replay it without interleaving
+    # with other workers
+    buf = io.StringIO()
+    mark = len(tracer.records)
+    with contextlib.redirect_stdout(buf):
+        result = func(item)
+
+    return buf.getvalue(), result, tracer.records[mark:]
+
+
+def runOrdered(func, items, nWorkers=1, onResult=None):
+    """
+    Apply func to each item and return the results in input order. With
+    nWorkers > 1 items run in a fork-based process pool (so functions defined
+    in a driver script are visible to workers); each worker's stdout is
+    captured and written out in input order once that item completes, and
+    its seatree.trace spans are merged into the parent tracer. onResult, if
+    given, is called in the parent with each result in order. dask
+    computations in workers run on the synchronous scheduler
+    """
+    items = list(items)
+    if nWorkers <= 1 or len(items) <= 1:
+        results = []
+        for item in items:
+            results.append(func(item))
+            if onResult is not None:
+                onResult(results[-1])
+        return results
+    ctx = mp.get_context("fork")
+    results = []
+    with ProcessPoolExecutor(max_workers=min(nWorkers, len(items)),
+                             mp_context=ctx,
+                             initializer=_initWorker) as pool:
+        futures = [pool.submit(_captured, func, item) for item in items]
+        for future in futures:
+            log, result, records = future.result()
+            tracer.records.extend(records)
+            sys.stdout.write(log)
+            sys.stdout.flush()
+            results.append(result)
+            if onResult is not None:
+                onResult(result)
+
+    return results
@@ -0,0 +1,808 @@
+"""
+Created on Sun Oct 18 2026
+
+The extractWaveClim.py processing as importable stages. A WaveClimRun is
+built from a config (defaults below, overridden from a JSON file and/or
+keywords) and runs any of the stages
+
+    clim      - COWCLIP 8-statistic wave climatologies (and percentiles)
+    reports   - WOA18, wave and AGCD values at every site, the results
+                store and the mean/max/min text tables
+    regrid    - wave-clim products and the AGCD climatologies on the
+                WOA18 1x1 grid
+    ensemble  - full-grid ensemble statistics over the regrids
+
+Stages find their inputs through the products manifest, so each can be run
+on its own. Files are read through a seatree.backend ("cdms2" or "xarray"
+with dask chunks), and stage modules are imported when their stage runs,
+so small jobs do not pay for scipy, pyarrow or matplotlib
+
+usage: python -m seatree run --config run.json --backend xarray
+
+PJD 18 Oct 2026     - started, stages moved from extractWaveClim.py
+PJD 18 Oct 2026     - regrid and AGCD sampling in nWorkers processes, static
+                      grids/weights shared via seatree.shared
+PJD 18 Oct 2026     - AGCD climatologies regridded to WOA18 1x1
+
+@author: durack1
+"""
+
+# %% imports
+import datetime
+import json
+import numpy as np
+import os
+import sys
+from seatree.backend import getBackend
+from seatree.build import ProductStore
+from seatree.cowclip import insts, instFile, skipReason
+from seatree.trace import span, tracer
+
+# %% function defs
+
+stageNames = ["clim", "reports", "regrid", "ensemble"]
+stageMethods = {"clim": "climatologies", "reports": "reports",
+                "regrid": "regrid", "ensemble": "ensemble"}
+
+defaults = {
+    # paths - products, reports and caches go to home/sub
+    "home": "/home/durack1/p-work/Shared",
+    "sub": "220809_murialdo1",
+    "waveData": "220825-COWCLIP2p1",
+    "woaData": "obs_data/WOD18/190312",
+    "agcdData": "220829-AGCD",
+    # durolib (global attributes), skipped if it cannot be imported
+    "durolibPath": "/home/durack1/git/durolib/durolib",
+    # I/O backend - "cdms2" or "xarray"; backendChunks are the xarray/dask
+    # chunks ("auto" follows the files' own chunking) and backendScheduler
+    # the dask scheduler (None for the default, or a distributed client)
+    "backend": "cdms2",
+    "backendChunks": "auto",
+    "backendScheduler": None,
+    # Number of institutions processed concurrently
+    "nWorkers": 1,
+    # Validation plots - "interactive" (plt.show, serial only),
+    # "background" (rendered by plotWorkers processes, for batch nodes) or
+    # "skip"; plotStride > 1 downsamples fields before contouring
+    "plotMode": "background",
+    "plotWorkers": 2,
+    "plotStride": 1,
+    # Upper bound on the size of each block read from the COWCLIP files (MB)
+    "chunkMB": 512,
+    # Output layout - "netcdf4" (zlib) or "zarr" (readable by the xarray
+    # backend only); outChunk is the lat/lon tile of each chunk, which
+    # always spans every stat and month so a site's values are one read
+    "outFormat": "netcdf4",
+    "outChunk": [8, 8],
+    "outComplevel": 4,
+    # Optional per-calendar-month percentiles of the monthly series, e.g.
+    # {"hs_avg": [10, 90]}; pctlRanges and pctlBins set the histogram
+    # sketch used when a latitude band's full record does not fit in chunkMB
+    "pctlStats": {},
+    "pctlRanges": {"dir": [0., 360.], "hs": [0., 30.], "tm": [0., 30.]},
+    "pctlBins": 256,
+    # Bump a stage version to force a rebuild after changing how it is
+    # computed (see seatree.build)
+    "stageVersions": {"wave-clim": 3, "pctl": 4, "woa1x1": 2, "ensemble": 1},
+    # Site catalog (CSV or GeoJSON, see seatree.sites); None is the -22S,
+    # 113E site, whose box is the AGCD region of the original tables
+    "siteFile": None,
+    # wave-clim products sampled at the sites
+    "srcs": ["CSIRO-CAWCR", "ERAI", "GOW1"],
+    "regridMethod": "conservative",  # or "bilinear"
+    "ensPercentiles": [10, 90],
+    # tracemalloc adds overhead to allocation-heavy stages, False for timing
+    "traceMemory": True,
+}
+
+waveStats = ["dir_avg", "dir_std", "hs_avg", "hs_max", "hs_p10", "tm_avg",
+             "tm_max", "tm_p10"]
+
+# mean, max and min table rows, (label, (source, variable, statistic))
+reportRows = {
+    "Mean": [("Ocean wave dir_avg deg,  ", ("ensemble", "dir_avg", "mean")),
+             ("Ocean wave  hs_avg m,    ", ("ensemble", "hs_avg", "mean")),
+             ("Ocean wave  tm_avg s,    ", ("ensemble", "tm_avg", "mean")),
+             ("Ocean surface temp degC, ", ("WOA18", "sst", "mean")),
+             ("Ocean 500m temp degC,    ", ("WOA18", "t500", "mean")),
+             ("Land screen temp degC,   ", ("AGCD", "tmean", "mean")),
+             ("Land solar energy MJ m^2,", ("AGCD", "solar", "mean"))],
+    "Max ": [("Ocean wave dir_avg deg,  ", None),
+             ("Ocean wave  hs_max m,    ", ("ensemble", "hs_max", "max")),
+             ("Ocean wave  tm_max s,    ", ("ensemble", "tm_max", "max")),
+             ("Ocean surface temp degC, ", None),
+             ("Ocean 500m temp degC,    ", None),
+             ("Land screen temp degC,   ", ("AGCD", "tmax", "max")),
+             ("Land solar energy MJ m^2,", None)],
+    "Min ": [("Ocean wave dir_avg deg,  ", None),
+             ("Ocean wave  hs_p10 m,    ", ("ensemble", "hs_p10", "max")),
+             ("Ocean wave  tm_p10 s,    ", ("ensemble", "tm_p10", "max")),
+             ("Ocean surface temp degC, ", None),
+             ("Ocean 500m temp degC,    ", None),
+             ("Land screen temp degC,   ", ("AGCD", "tmin", "min")),
+             ("Land solar energy MJ m^2,", None)],
+}
+
+
+def loadConfig(filePath=None, **overrides):
+    """
+    defaults updated from a JSON file and then keyword overrides; unknown
+    keys raise
+    """
+    config = json.loads(json.dumps(defaults))
+    updates = {}
+    if filePath is not None:
+        with open(filePath) as fh:
+            updates.update(json.load(fh))
+    updates.update(overrides)
+    unknown = sorted(set(updates) - set(defaults))
+    if unknown:
+        raise ValueError("loadConfig: unknown keys %s" % ", ".join(unknown))
+    config.update(updates)
+
+    return config
+
+
+def globalAtts(outName, durolibPath=None):
+    """
+    Add the durolib standard global attributes to a NetCDF file, returning
+    False (file unchanged) where cdms2 or durolib are not importable
+    """
+    if durolibPath and durolibPath not in sys.path:
+        sys.path.insert(0, durolibPath)
+    try:
+        import cdms2 as cdm
+        from durolib import globalAttWrite
+    except ImportError:
+        return False
+    outhandle = cdm.open(outName, 'a')
+    globalAttWrite(outhandle, options=None)
+    outhandle.close()
+
+    return True
+
+
+class WaveClimRun:
+    """
+    One run of the stages for a config (see loadConfig), with its own
+    timestamp for output names. Picklable, so processInst can be sent to
+    seatree.parallel workers
+    """
+
+    def __init__(self, config=None):
+        self.config = loadConfig() if config is None else config
+        cfg = self.config
+        self.timeFormat = datetime.datetime.now().strftime("%y%m%dT%H%M%S")
+        self.outDir = os.path.join(cfg["home"], cfg["sub"])
+        self.waveDir = os.path.join(self.outDir, cfg["waveData"])
+        backendArgs = {}
+        if cfg["backend"] == "xarray":
+            backendArgs = {"chunks": cfg["backendChunks"],
+                           "scheduler": cfg["backendScheduler"]}
+        self.backend = getBackend(cfg["backend"], **backendArgs)
+        # Products manifest - each product is keyed by its input file
+        # hashes, its parameters (incl. the institution's insts entry) and
+        # upstream products, and only rebuilt when that key changes
+        self.products = ProductStore(os.path.join(self.outDir, "build"))
+        self.runInsts = []
+        for inst in insts:
+            reason = skipReason(inst)
+            if reason:
+                print("inst:", inst)
+                print(reason)
+                continue
+            self.runInsts.append(inst)
+
+    def outPath(self, *parts):
+        # <outDir>/<timeFormat>_<parts...>
+        return os.path.join(self.outDir, "_".join((self.timeFormat,) + parts))
+
+    def outParams(self):
+        # output format, chunking and compression, part of every written
+        # product's key so changing them rebuilds the products
+        cfg = self.config
+
+        return {"format": cfg["outFormat"], "chunk": list(cfg["outChunk"]),
+                "complevel": cfg["outComplevel"]}
+
+    def writeWave(self, outName, outvar, timeAx, latAx, lonAx, varName="wave",
+                  statNames=None, **tags):
+        # Write a float32 (stat, month, lat, lon) wave climatology with
+        # coordinates, chunked for point reads; tags (e.g. inst) label the
+        # span
+        from seatree.output import writeProduct
+
+        cfg = self.config
+        with span("write", file=os.path.basename(outName), **tags):
+            writeProduct(outName, outvar, timeAx, latAx, lonAx,
+                         varName=varName, statNames=statNames,
+                         fmt=cfg["outFormat"], pointChunk=cfg["outChunk"],
+                         complevel=cfg["outComplevel"])
+            if cfg["outFormat"] == "netcdf4":
+                globalAtts(outName, cfg["durolibPath"])
+
+    def productAxes(self, fileName):
+        # time/lat/lon axes of an existing wave-clim product
+        fh = self.backend.open(fileName)
+        fileVar = fh["wave"]
+        axes = [fileVar.getTime().clone(), fileVar.getLatitude().clone(),
+                fileVar.getLongitude().clone()]
+        fh.close()
+
+        return axes
+
+    def processInst(self, inst):
+        # Build and write the 8x12 wave climatology for a single
+        # institution, skipping products whose inputs and insts entry are
+        # unchanged
+        from seatree.cowclip import instClimatology
+        from seatree.points import getLocator
+        from seatree.quantiles import (percentileMethod,
+                                       streamMonthlyPercentiles)
+
+        cfg = self.config
+        chunkBytes = cfg["chunkMB"] * 1024**2
+        print("inst:", inst)
+        inputs = [instFile(varId, inst, self.waveDir) for varId in insts[inst]]
+        name = "_".join([inst, "wave-clim"])
+        params = {"insts": insts[inst], "output": self.outParams(),
+                  "version": cfg["stageVersions"]["wave-clim"]}
+        key = self.products.stageKey("wave-clim", inputs=inputs,
+                                     params=params)
+        built = []
+        plotJobs = []
+        outName = self.products.current(name, key)
+        axes = None
+        if outName is not None:
+            print(name, "up to date:", outName)
+        else:
+            # Generate climatological annual cycle for all eight statistics,
+            # streamed through in chunks of at most chunkMB
+            outvar, statNames, landVals, timeAx, latAx, lonAx = \
+                instClimatology(inst, insts[inst], chunkBytes,
+                                dataDir=self.waveDir, backend=self.backend)
+            axes = [timeAx, latAx, lonAx]
+            # Validate - figures are returned for the plot pool to render
+            for varCount, varName in enumerate(statNames):
+                varId = varName.split("_")[0]
+                landVal = landVals[varCount]
+                plotJobs.append({
+                    "outFile": self.outPath(inst, varName, "wave-clim",
+                                            "1980-2014.png"),
+                    "lon": lonAx[:], "lat": latAx[:],
+                    "field": outvar[varCount, 0, ],
+                    "title": " ".join([inst, varId, varName,
+                                       "{:5.2f}".format(landVal)])})
+                # get index of 50N, 90E
+                lat, lon = latAx[:], lonAx[:]
+                latInd, lonInd = [int(ind[0]) for ind in
+                                  getLocator(lat, lon).nearest(50, 90)]
+                print("check value [lat50 300/45.2N, lon100 250/100E")
+                print("check value [lat50:", latInd, lat[latInd], ", lon90:",
+                      lonInd, lon[lonInd], outvar[varCount, 0, latInd, lonInd])
+
+            # create outfile and write
+            outName = self.outPath(inst, "wave-clim", "1980-2014.nc")
+            self.writeWave(outName, outvar, timeAx, latAx, lonAx, inst=inst)
+            built.append((name, key, outName, "wave-clim", inputs, params))
+
+        # percentiles, (pctl, 12, lat, lon) per requested statistic
+        for varName in cfg["pctlStats"]:
+            varId = varName.split("_")[0]
+            pctlFile = instFile(varId, inst, self.waveDir)
+            pctlProduct = "_".join([inst, varName, "pctl"])
+            # exact or histogram follows from the file shape and chunkMB,
+            # so the method (and the sketch's bins) are part of the key
+            fh = self.backend.open(pctlFile)
+            pctlMethod = percentileMethod(fh[varName].shape, chunkBytes)
+            fh.close()
+            pctlParams = {"insts": insts[inst][varId][varName],
+                          "percentiles": cfg["pctlStats"][varName],
+                          "method": pctlMethod,
+                          "range": cfg["pctlRanges"][varId],
+                          "output": self.outParams(),
+                          "version": cfg["stageVersions"]["pctl"]}
+            if pctlMethod == "histogram":
+                pctlParams["nBins"] = cfg["pctlBins"]
+            pctlKey = self.products.stageKey("pctl", inputs=[pctlFile],
+                                             params=pctlParams)
+            if self.products.current(pctlProduct, pctlKey) is not None:
+                print(pctlProduct, "up to date")
+                continue
+            with span("percentile", inst=inst, var=varName):
+                fh = self.backend.open(pctlFile)
+                pctl = streamMonthlyPercentiles(
+                    fh[varName], cfg["pctlStats"][varName], chunkBytes,
+                    method=pctlMethod, valueRange=cfg["pctlRanges"][varId],
+                    nBins=cfg["pctlBins"],
+                    instVal=insts[inst][varId][varName])
+                fh.close()
+            if axes is None:
+                axes = self.productAxes(outName)
+            pctlName = self.outPath(inst, varName, "pctl", "1980-2014.nc")
+            self.writeWave(pctlName, pctl, *axes, inst=inst, var=varName)
+            built.append((pctlProduct, pctlKey, pctlName, "pctl", [pctlFile],
+                          pctlParams))
+
+        return outName, plotJobs, built
+
+    def climatologies(self):
+        """
+        Build (or reuse) every runnable institution's wave-clim product,
+        nWorkers at a time, returning the product paths
+        """
+        from seatree.parallel import runOrdered
+        from seatree.plotting import PlotPool
+
+        cfg = self.config
+        plotMode = cfg["plotMode"]
+        if cfg["nWorkers"] > 1 and plotMode == "interactive":
+            print("interactive plots need nWorkers = 1, rendering in "
+                  "background")
+            plotMode = "background"
+
+        def collectInst(result):
+            # register an institution's new products and hand its
+            # validation figures to the plot pool (parent process only)
+            for name, key, path, stage, inputs, params in result[2]:
+                self.products.record(name, key, path, stage=stage,
+                                     inputs=inputs, params=params)
+            for plotJob in result[1]:
+                plotPool.submit(**plotJob)
+
+        with PlotPool(mode=plotMode, nWorkers=cfg["plotWorkers"],
+                      stride=cfg["plotStride"]) as plotPool:
+            results = runOrdered(self.processInst, self.runInsts,
+                                 nWorkers=cfg["nWorkers"],
+                                 onResult=collectInst)
+
+        return [result[0] for result in results]
+
+    def sites(self):
+        """
+        Site catalog from siteFile, or the default NWAustData site
+        """
+        from seatree.sites import loadSites, siteCatalog
+
+        if self.config["siteFile"] is None:
+            return siteCatalog(["NWAustData"], [-22], [113],
+                               [[-22.5, -21.7, 113.65, 114.25]])
+
+        return loadSites(self.config["siteFile"])
+
+    def woaValues(self, sites):
+        """
+        WOA18 (month, site) surface and 500 m temperature, reading only the
+        site columns of each monthly file
+        """
+        from seatree.woa import extractWoaProfiles
+
+        fileNames = [os.path.join(self.config["home"], self.config["woaData"],
+                                  "".join(["woa18_decav_t",
+                                           "{:02d}".format(mon), "_04.nc"]))
+                     for mon in np.arange(1, 13)]
+        profiles, levs = extractWoaProfiles(
+            fileNames, "t_an", sites["lat"], sites["lon"], depths=[0, 500],
+            backend=self.backend)
+        # SST, 500mTemp - (month, site)
+        sst, t500 = [profiles[:, count].filled(np.nan) for count in range(2)]
+
+        return sst, t500
+
+    def waveValues(self, sites):
+        """
+        Masked (src, stat, month, site) wave statistics of the current srcs
+        wave-clim products, one hyperslab read per file
+        """
+        from seatree.extract import extractSites
+
+        # wave direction - dir_avg, dir_std
+        # wave height - hs_avg, hs_max, hsP10
+        # wave period - tm_avg, tm_max, tmP10
+        srcs = self.config["srcs"]
+        fileNames = [self.products.path("_".join([src, "wave-clim"]))
+                     for src in srcs]
+        wave = extractSites(fileNames, "wave", sites["lat"], sites["lon"],
+                            backend=self.backend)
+        # Check values, first site
+        for count, src in enumerate(srcs):
+            print(fileNames[count])
+            for mon in np.arange(0, 12):
+                print("check values", "\n",
+                      "mon:", mon, "\n",
+                      "dir:", wave[count, 0:2, mon, 0], "\n",
+                      "Hs:", wave[count, 2:5, mon, 0], "\n",
+                      "Tm:", wave[count, 5:8, mon, 0])
+                print("-----")
+            # Collect monthly values
+            for stat in ["dir_avg", "hs_avg", "tm_avg"]:
+                print(stat + ":", ["{:6.2f},".format(i) for i in
+                                   wave[count, waveStats.index(stat), :,
+                                        0].filled(np.nan)])
+            print("*-----*")
+
+        return wave
+
+    def agcdCache(self):
+        # parsed AGCD grids are cached as memory-mappable arrays across runs,
+        # so every process maps the same pages
+        from seatree.gridcache import GridCache
+
+        return GridCache(os.path.join(self.outDir, "agcdCache"),
+                         maxBytes=4 * 1024**3)
+
+    def agcdFiles(self, varName):
+        # the 12 monthly AGCD climatology zips of a variable
+        mons = ["jan", "feb", "mar", "apr", "may", "jun",
+                "jul", "aug", "sep", "oct", "nov", "dec"]
+
+        return [os.path.join(self.outDir, self.config["agcdData"],
+                             "".join([varName, mon, ".zip"])) for mon in mons]
+
+    def agcdVar(self, job):
+        # Sample one AGCD variable's 12 monthly grids at every site. Grids
+        # are mapped from the cache by the keys the parent resolved (a zip
+        # is only read to parse it on a cache miss) and sampled month by
+        # month, reading only the site cells; region weights are attached
+        # from the shared store
+        from seatree.shared import SharedStore
+        from seatree.sites import sampleGrid
+
+        shared = SharedStore(job["shared"])
+        agcdCache = self.agcdCache()
+        weights = None if job["weights"] is None else shared[job["weights"]]
+        values = []
+        for filePath, key in zip(job["files"], job["keys"]):
+            mat, lat, lon = agcdCache.readGridAsciiZip(filePath, key=key)
+            values.append(sampleGrid(mat, lat, lon, job["sites"],
+                                     weights=weights).filled(np.nan))
+        values = np.stack(values)
+        shared.close()
+
+        return job["name"], values
+
+    def agcdValues(self, sites):
+        """
+        AGCD (month, site) tmean, tmax, tmin and solar - the area-weighted
+        box/polygon mean (or nearest cell) of every monthly grid. Variables
+        are sampled nWorkers at a time. Each zip is resolved to its grid
+        cache key here, once, and site region weights are built once per
+        AGCD grid and published in a seatree.shared store
+        """
+        from seatree.parallel import runOrdered
+        from seatree.points import getLocator, gridKey
+        from seatree.regions import regionWeights
+        from seatree.shared import SharedStore
+        from seatree.sites import siteRegions
+
+        varMap = {
+            "tmean": "mean",
+            "tmax": "mxt",
+            "tmin": "mnt",
+            "rh09": "rh09",
+            "rh15": "rh15",
+            "sol": "solar",
+        }
+        agcdCache = self.agcdCache()
+        # site box/polygon area weights, built once per AGCD grid
+        regionDir = os.path.join(self.outDir, "regionWeights")
+        inds, regions = siteRegions(sites)
+        with SharedStore() as shared:
+            jobs = []
+            for varKey, varName in varMap.items():
+                if "rh" in varKey:
+                    continue  # skip
+                filePaths = self.agcdFiles(varName)
+                keys = [agcdCache.zipKey(filePath) for filePath in filePaths]
+                # first month from the cache (parsed on first use) for the
+                # grid, nearest cell to the first site
+                mat, lat, lon = agcdCache.readGridAsciiZip(filePaths[0],
+                                                           key=keys[0])
+                latInd, lonInd = [int(ind[0]) for ind in getLocator(
+                    lat, lon).nearest(sites["lat"][0], sites["lon"][0])]
+                print("latInd:", latInd, lat[latInd],
+                      "lonInd:", lonInd, lon[lonInd])
+                weightName = None
+                if inds:
+                    weightName = "regions-" + gridKey(lat, lon)
+                    if weightName not in shared:
+                        shared.publish(weightName, regionWeights(
+                            lat, lon, regions, cacheDir=regionDir))
+                jobs.append({"name": varName, "files": filePaths,
+                             "keys": keys, "sites": sites, "weights": weightName,
+                             "shared": shared.rootDir})
+            results = runOrdered(self.agcdVar, jobs,
+                                 nWorkers=self.config["nWorkers"])
+
+        return dict(results)
+
+    def reports(self):
+        """
+        Sample WOA18, the wave-clim products and AGCD at every site, append
+        the (month, site) series to the results store and render the mean,
+        max and min tables, <stamp>_durack1-<quantity>-<site>.txt
+        """
+        from seatree.ensemble import circularMean
+        from seatree.report import renderSummary
+        from seatree.results import ResultsStore
+
+        timeFormat = self.timeFormat
+        sites = self.sites()
+        print("nSites:", len(sites["name"]))
+        sst, t500 = self.woaValues(sites)
+        wave = self.waveValues(sites)
+        agcd = self.agcdValues(sites)
+        # source mean/max of the wave statistics, (month, site); direction
+        # is a circular mean
+        dirAvg, dirStd, hsAvg, hsMax, hsP10, tmAvg, tmMax, tmP10 = [
+            wave[:, stat].filled(np.nan) for stat in range(8)]
+        dirAvgSrc = circularMean(dirAvg, axis=0).filled(np.nan)
+        hsAvgSrc, tmAvgSrc = [arr.mean(axis=0) for arr in [hsAvg, tmAvg]]
+        hsMaxSrc, tmMaxSrc, hsP10Src, tmP10Src = [
+            arr.max(axis=0) for arr in [hsMax, tmMax, hsP10, tmP10]]
+        # every (month, site) series goes to the results store, appended as
+        # Parquet parts tagged with this run's timeFormat
+        siteNames = sites["name"]
+        with ResultsStore(os.path.join(self.outDir, "results")) as results:
+            for count, src in enumerate(self.config["srcs"]):
+                for stat, varName in enumerate(waveStats):
+                    results.append(timeFormat, siteNames, src, varName,
+                                   "value", wave[count, stat].filled(np.nan))
+            for varName, values in [("dir_avg", dirAvgSrc),
+                                    ("hs_avg", hsAvgSrc),
+                                    ("tm_avg", tmAvgSrc)]:
+                results.append(timeFormat, siteNames, "ensemble", varName,
+                               "mean", values)
+            for varName, values in [("hs_max", hsMaxSrc),
+                                    ("tm_max", tmMaxSrc),
+                                    ("hs_p10", hsP10Src),
+                                    ("tm_p10", tmP10Src)]:
+                results.append(timeFormat, siteNames, "ensemble", varName,
+                               "max", values)
+            results.append(timeFormat, siteNames, "WOA18", "sst", "mean", sst)
+            results.append(timeFormat, siteNames, "WOA18", "t500", "mean",
+                           t500)
+            results.append(timeFormat, siteNames, "AGCD", "tmean", "mean",
+                           agcd["mean"])
+            results.append(timeFormat, siteNames, "AGCD", "tmax", "max",
+                           agcd["mxt"])
+            results.append(timeFormat, siteNames, "AGCD", "tmin", "min",
+                           agcd["mnt"])
+            results.append(timeFormat, siteNames, "AGCD", "solar", "mean",
+                           agcd["solar"])
+        # rendered from one query of this run's results
+        reportValues = results.lookup(run=timeFormat, source=[
+            "ensemble", "WOA18", "AGCD"])
+        for siteName in siteNames:
+            for quantity in reportRows:
+                renderSummary(self.outPath("".join([
+                    "durack1-", quantity.strip().lower(), "-", siteName,
+                    ".txt"])), timeFormat, quantity, siteName,
+                    reportRows[quantity], reportValues)
+
+    def woaGrid(self):
+        """
+        WOA18 1x1 target latitude, longitude and depth axes, and the file
+        they are read from
+        """
+        woaFile = os.path.join(self.config["home"], self.config["woaData"],
+                               "woa18_decav_s00_01.nc")
+        with span("open", file=os.path.basename(woaFile)):
+            fh = self.backend.open(woaFile)
+            fileVar = fh["s_oa"]
+            woaLat = fileVar.getLatitude().clone()
+            woaLon = fileVar.getLongitude().clone()
+            woaLvls = fileVar.getLevel().clone()
+            fh.close()
+
+        return woaLat, woaLon, woaLvls, woaFile
+
+    def regridInst(self, job):
+        # Regrid one institution's wave-clim product, the WOA18 grid and
+        # weights are attached from the shared store rather than reloaded
+        from seatree.backend import Axis
+        from seatree.regrid import applyWeights
+        from seatree.shared import SharedStore
+
+        inst = job["inst"]
+        shared = SharedStore(job["shared"])
+        woaLat = Axis(shared["woaLat"], "lat", attributes=job["latAttrs"])
+        woaLon = Axis(shared["woaLon"], "lon", attributes=job["lonAttrs"])
+        with span("regrid", inst=inst):
+            fh = self.backend.open(self.products.path("_".join(
+                [inst, "wave-clim"])))
+            fileVar = fh["wave"]
+            wave = fileVar[:]
+            timeAx = fileVar.getTime().clone()
+            fh.close()
+            # all 8 stats x 12 months in one sparse multiply, land masks
+            # honoured
+            woaWave = applyWeights(shared[job["weights"]], wave,
+                                   (len(woaLat), len(woaLon)))
+        regridName = self.outPath(inst, "wave-clim_woa1x1", "1980-2014.nc")
+        self.writeWave(regridName, woaWave, timeAx, woaLat, woaLon, inst=inst)
+        shared.close()
+
+        return job["product"], job["key"], regridName
+
+    def regrid(self):
+        """
+        Regrid each institution's 8x12 climatology onto the WOA18 1x1 grid,
+        nWorkers at a time. Weights are computed once per source grid
+        (cached on disk as sparse matrices) and published with the WOA18
+        grid in a seatree.shared store that workers attach to
+        """
+        from seatree.parallel import runOrdered
+        from seatree.points import gridKey
+        from seatree.regrid import regridWeights
+        from seatree.shared import SharedStore
+
+        cfg = self.config
+        woaLat, woaLon, _, woaFile = self.woaGrid()
+        weightDir = os.path.join(self.outDir, "regridWeights")
+        regridParams = {"method": cfg["regridMethod"],
+                        "output": self.outParams(),
+                        "version": cfg["stageVersions"]["woa1x1"]}
+        with SharedStore() as shared:
+            for name, axis in [("woaLat", woaLat), ("woaLon", woaLon)]:
+                shared.publish(name, np.asarray(axis[:]))
+            jobs = []
+            for inst in self.runInsts:
+                # rebuilt when the institution's wave-clim product or the
+                # WOA grid change
+                name = "_".join([inst, "wave-clim"])
+                regridProduct = "_".join([inst, "wave-clim_woa1x1"])
+                regridKey = self.products.stageKey(
+                    "woa1x1", inputs=[woaFile], params=regridParams,
+                    upstream=[name])
+                if self.products.current(regridProduct,
+                                         regridKey) is not None:
+                    print(regridProduct, "up to date")
+                    continue
+                timeAx, lat, lon = self.productAxes(self.products.path(name))
+                weightName = "regrid-" + gridKey(lat[:], lon[:])
+                if weightName not in shared:
+                    shared.publish(weightName, regridWeights(
+                        lat[:], lon[:], woaLat[:], woaLon[:],
+                        method=cfg["regridMethod"], cacheDir=weightDir))
+                jobs.append({"inst": inst, "product": regridProduct,
+                             "key": regridKey, "weights": weightName,
+                             "shared": shared.rootDir,
+                             "latAttrs": dict(woaLat.attributes),
+                             "lonAttrs": dict(woaLon.attributes)})
+
+            def recordRegrid(result):
+                regridProduct, regridKey, regridName = result
+                self.products.record(regridProduct, regridKey, regridName,
+                                     stage="woa1x1", inputs=[woaFile],
+                                     params=regridParams)
+
+            runOrdered(self.regridInst, jobs, nWorkers=cfg["nWorkers"],
+                       onResult=recordRegrid)
+        self.regridAgcd(woaLat, woaLon, woaFile, weightDir, regridParams)
+
+    def regridAgcd(self, woaLat, woaLon, woaFile, weightDir, regridParams):
+        """
+        Regrid the AGCD monthly climatologies (tmean, tmax, tmin, solar)
+        onto the WOA18 1x1 grid as one (variable, month, lat, lon) product.
+        Grids come from the AGCD grid cache, weights from the same on-disk
+        cache as the wave regrids (keyed by the AGCD grid hash), and the NaN
+        land/sea mask is honoured. The zips carry no reference period, so
+        months are placed in a nominal year
+        """
+        from seatree.backend import Axis, monthlyTimeAxis
+        from seatree.regrid import applyWeights, regridWeights
+
+        cfg = self.config
+        agcdVars = ["mean", "mxt", "mnt", "solar"]
+        filePaths = [filePath for varName in agcdVars
+                     for filePath in self.agcdFiles(varName)]
+        missing = [filePath for filePath in filePaths
+                   if not os.path.isfile(filePath)]
+        if missing:
+            print("AGCD_woa1x1 skipped, missing", os.path.basename(missing[0]))
+            return
+        regridProduct = "AGCD_woa1x1"
+        regridKey = self.products.stageKey(
+            "woa1x1", inputs=filePaths + [woaFile], params=regridParams)
+        if self.products.current(regridProduct, regridKey) is not None:
+            print(regridProduct, "up to date")
+            return
+        agcdCache = self.agcdCache()
+        out = np.ma.masked_all((len(agcdVars), 12, len(woaLat), len(woaLon)),
+                               dtype=np.float32)
+        with span("regrid", inst="AGCD"):
+            for count, varName in enumerate(agcdVars):
+                grids = [agcdCache.readGridAsciiZip(filePath)
+                         for filePath in self.agcdFiles(varName)]
+                lat, lon = grids[0][1], grids[0][2]
+                weights = regridWeights(lat, lon, woaLat[:], woaLon[:],
+                                        method=cfg["regridMethod"],
+                                        cacheDir=weightDir)
+                stack = np.ma.masked_invalid(np.stack([grid[0]
+                                                       for grid in grids]))
+                out[count] = applyWeights(weights, stack,
+                                          (len(woaLat), len(woaLon)))
+                del grids, stack
+        # mid-month days of a nominal (non-leap) year, bounded by month
+        days = np.cumsum([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+        timeAx = monthlyTimeAxis(Axis(
+            0.5 * (days[:-1] + days[1:]), "time",
+            attributes={"units": "days since 2001-01-01 00:00:00",
+                        "calendar": "standard"}))
+        timeAx.long_name = "climatological month (nominal year)"
+        regridName = self.outPath("AGCD", "woa1x1", "clim.nc")
+        self.writeWave(regridName, out, timeAx, woaLat, woaLon,
+                       varName="agcd", statNames=["tmean", "tmax", "tmin",
+                                                  "solar"], inst="AGCD")
+        self.products.record(regridProduct, regridKey, regridName,
+                             stage="woa1x1", inputs=filePaths + [woaFile],
+                             params=regridParams)
+
+    def ensemble(self):
+        """
+        Mean, spread, max, min and percentiles across the WOA18 1x1 regrids
+        of every institution, streamed in latitude bands so members are
+        never all held in memory; dir_avg uses circular statistics
+        """
+        from seatree.ensemble import ensembleReduce
+
+        cfg = self.config
+        ensParams = {"percentiles": cfg["ensPercentiles"], "dirStats": [0],
+                     "output": self.outParams(),
+                     "version": cfg["stageVersions"]["ensemble"]}
+        ensUpstream = ["_".join([inst, "wave-clim_woa1x1"])
+                       for inst in self.runInsts]
+        ensKey = self.products.stageKey("ensemble", params=ensParams,
+                                        upstream=ensUpstream)
+        if self.products.current("ensemble_wave-clim_woa1x1",
+                                 ensKey) is not None:
+            print("ensemble_wave-clim_woa1x1 up to date")
+            return
+        with span("ensemble"):
+            ens = ensembleReduce(
+                [self.products.path(name) for name in ensUpstream],
+                chunkBytes=cfg["chunkMB"] * 1024**2,
+                percentiles=cfg["ensPercentiles"], dirStats=[0],
+                backend=self.backend)
+        ensTime, woaLat, woaLon = self.productAxes(
+            self.products.path(ensUpstream[0]))
+        for quantity in ["mean", "spread", "max", "min"]:
+            self.writeWave(self.outPath("ensemble", quantity,
+                                        "wave-clim_woa1x1", "1980-2014.nc"),
+                           ens[quantity], ensTime, woaLat, woaLon,
+                           var=quantity)
+        # percentiles as (pctl x stat, month, lat, lon)
+        if ens["pctl"] is not None:
+            self.writeWave(
+                self.outPath("ensemble", "pctl", "wave-clim_woa1x1",
+                             "1980-2014.nc"),
+                ens["pctl"].reshape((-1,) + ens["pctl"].shape[2:]), ensTime,
+                woaLat, woaLon, var="pctl")
+        # the mean file stands in for the set in the manifest
+        self.products.record("ensemble_wave-clim_woa1x1", ensKey,
+                             self.outPath("ensemble", "mean",
+                                          "wave-clim_woa1x1", "1980-2014.nc"),
+                             stage="ensemble", params=ensParams)
+
+    def run(self, stages=None):
+        """
+        Run stages (default all, in stageNames order) under the tracer and
+        write <stamp>_trace.jsonl with a per-stage/institution summary.
+        Returns the trace file name
+        """
+        stages = stageNames if stages is None else list(stages)
+        unknown = sorted(set(stages) - set(stageNames))
+        if unknown:
+            raise ValueError("WaveClimRun: unknown stages %s"
+                             % ", ".join(unknown))
+        tracer.start(memory=self.config["traceMemory"])
+        for stage in stageNames:
+            if stage in stages:
+                getattr(self, stageMethods[stage])()
+        traceName = self.outPath("trace.jsonl")
+        tracer.write(traceName)
+        print("traceName:", traceName)
+        print(tracer.summary())
+
+        return traceName
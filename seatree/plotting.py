@@ -0,0 +1,107 @@
+"""
+Created on Sun Oct 18 2026
+
+Validation figure rendering decoupled from the numerical pipeline. A
+PlotPool either renders climatology maps in background worker processes
+(headless Agg, no pyplot state), draws them inline for interactive checks,
+or skips them; fields can be downsampled with a stride before rendering
+
+PJD 18 Oct 2026     - started
+
+@author: durack1
+"""
+
+# %% imports
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
+import numpy as np
+
+# %% function defs
+
+
+def drawClimMap(fig, lon, lat, field, title):
+    """
+    Draw a filled-contour validation map with colorbar onto fig
+    """
+    from matplotlib import cm
+    from mpl_toolkits.axes_grid1 import make_axes_locatable
+    ax1 = fig.add_subplot(1, 1, 1)
+    ax1.set_title(title)
+    ax1.set_xlabel('Longitude')
+    ax1.set_ylabel('Latitude')
+    cs1 = ax1.contourf(lon, lat, field, 20, cmap=cm.coolwarm, origin="lower")
+    divider = make_axes_locatable(ax1)
+    cax = divider.append_axes("right", "5%", pad="3%")
+    fig.colorbar(cs1, cax=cax)
+    fig.tight_layout()
+
+    return fig
+
+
+def renderClimMap(outFile, lon, lat, field, title, dpi=300):
+    """
+    Render a validation map straight to outFile using the object-oriented
+    Agg canvas, so it is safe in forked worker processes
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    drawClimMap(fig, lon, lat, field, title)
+    fig.savefig(outFile, dpi=dpi)
+
+    return outFile
+
+
+class PlotPool:
+    """
+    Validation plot dispatcher. mode is "background" (render in nWorkers
+    processes while the caller continues), "interactive" (render inline and
+    plt.show) or "skip". stride > 1 downsamples fields before rendering
+    """
+
+    def __init__(self, mode="background", nWorkers=1, stride=1, dpi=300):
+        if mode not in ("background", "interactive", "skip"):
+            raise ValueError("PlotPool: unknown mode %s" % mode)
+        self.mode = mode
+        self.stride = max(1, int(stride))
+        self.dpi = dpi
+        self.futures = []
+        self.pool = None
+        if mode == "background":
+            self.pool = ProcessPoolExecutor(
+                max_workers=nWorkers, mp_context=mp.get_context("fork"))
+
+    def submit(self, outFile, lon, lat, field, title):
+        if self.mode == "skip":
+            return
+        step = slice(None, None, self.stride)
+        lon = np.asarray(lon)[step]
+        lat = np.asarray(lat)[step]
+        field = np.ma.asarray(field)[step, step]
+        if self.mode == "background":
+            self.futures.append(self.pool.submit(
+                renderClimMap, outFile, lon, lat, field, title, self.dpi))
+            return
+        from matplotlib import pyplot as plt
+        fig = drawClimMap(plt.figure(), lon, lat, field, title)
+        plt.show()
+        fig.savefig(outFile, dpi=self.dpi)
+        plt.close(fig)
+
+    def close(self):
+        """
+        Wait for outstanding renders, re-raising any rendering error
+        """
+        if self.pool is not None:
+            for future in self.futures:
+                future.result()
+            self.pool.shutdown()
+            self.pool = None
+        self.futures = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
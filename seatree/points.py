@@ -0,0 +1,143 @@
+"""
+Created on Sun Oct 18 2026
+
+Nearest-grid-point and bilinear point location on rectilinear lat/lon grids.
+A GridLocator builds sorted axis indexes once per grid; getLocator caches
+locators keyed by a hash of the grid coordinates so repeated files on the
+same grid reuse them. Queries are vectorized over any number of sites
+
+PJD 18 Oct 2026     - started
+
+@author: durack1
+"""
+
+# %% imports
+import hashlib
+import numpy as np
+
+# %% function defs
+
+_locatorCache = {}
+
+
+def gridKey(lat, lon):
+    """
+    Hash identifying a grid from its latitude and longitude coordinates
+    """
+    sha = hashlib.sha1()
+    for axis in (lat, lon):
+        axis = np.ascontiguousarray(axis, dtype=np.float64)
+        sha.update(str(axis.shape).encode())
+        sha.update(axis.tobytes())
+
+    return sha.hexdigest()
+
+
+class _SortedAxis:
+    # Binary-search index over a 1-D coordinate, optionally cyclic (360 deg)
+
+    def __init__(self, values, cyclic=False):
+        values = np.asarray(values, dtype=np.float64)
+        self.size = values.size
+        self.order = np.argsort(values, kind="stable")
+        self.sorted = values[self.order]
+        self.cyclic = cyclic
+        self.lo = self.sorted[0]
+        if cyclic:
+            # append the first cell shifted by 360 so searches wrap
+            self.sorted = np.append(self.sorted, self.sorted[0] + 360.)
+            self.order = np.append(self.order, self.order[0])
+
+    def _normalise(self, x):
+        x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+        if self.cyclic:
+            x = self.lo + np.mod(x - self.lo, 360.)
+        return x
+
+    def nearest(self, x):
+        x = self._normalise(x)
+        pos = np.clip(np.searchsorted(self.sorted, x), 1, self.sorted.size - 1)
+        left, right = pos - 1, pos
+        dLeft = np.abs(x - self.sorted[left])
+        dRight = np.abs(x - self.sorted[right])
+        iLeft, iRight = self.order[left], self.order[right]
+        # ties resolve to the lowest original index, as np.where(...)[0][0]
+        return np.where(dLeft < dRight, iLeft,
+                        np.where(dRight < dLeft, iRight,
+                                 np.minimum(iLeft, iRight)))
+
+    def bracket(self, x):
+        x = self._normalise(x)
+        pos = np.clip(np.searchsorted(self.sorted, x), 1, self.sorted.size - 1)
+        x0, x1 = self.sorted[pos - 1], self.sorted[pos]
+        weight = np.clip((x - x0) / (x1 - x0), 0., 1.)
+
+        return self.order[pos - 1], self.order[pos], weight
+
+
+class GridLocator:
+    """
+    Vectorized point lookups on a rectilinear grid. Longitudes spanning
+    (nearly) 360 degrees are treated as cyclic, and site longitudes are
+    wrapped into the grid's convention
+    """
+
+    def __init__(self, lat, lon):
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        self.key = gridKey(lat, lon)
+        self.shape = (lat.size, lon.size)
+        spacing = np.abs(np.diff(np.sort(lon))).max() if lon.size > 1 else 0.
+        cyclic = lon.size > 1 and (lon.max() - lon.min() + spacing) >= 359.99
+        self.lat = _SortedAxis(lat)
+        self.lon = _SortedAxis(lon, cyclic=cyclic)
+
+    def nearest(self, siteLat, siteLon):
+        """
+        Return (latInd, lonInd) integer arrays of the nearest grid cell
+        """
+        return self.lat.nearest(siteLat), self.lon.nearest(siteLon)
+
+    def bilinear(self, siteLat, siteLon):
+        """
+        Return (latInds, lonInds, weights) with latInds/lonInds of shape
+        (nSites, 2) and weights of shape (nSites, 2, 2) for the four
+        surrounding cells
+        """
+        lat0, lat1, wy = self.lat.bracket(siteLat)
+        lon0, lon1, wx = self.lon.bracket(siteLon)
+        latInds = np.stack([lat0, lat1], axis=-1)
+        lonInds = np.stack([lon0, lon1], axis=-1)
+        weights = (np.stack([1. - wy, wy], axis=-1)[:, :, None] *
+                   np.stack([1. - wx, wx], axis=-1)[:, None, :])
+
+        return latInds, lonInds, weights
+
+    def sample(self, field, siteLat, siteLon, method="nearest"):
+        """
+        Sample a (..., lat, lon) field at all sites, returning
+        (..., nSites). Bilinear weights are renormalised over unmasked corners
+        """
+        if method == "nearest":
+            latInd, lonInd = self.nearest(siteLat, siteLon)
+            return field[..., latInd, lonInd]
+        latInds, lonInds, weights = self.bilinear(siteLat, siteLon)
+        field = np.ma.asarray(field)
+        corners = field[..., latInds[:, :, None], lonInds[:, None, :]]
+        valid = ~np.ma.getmaskarray(corners)
+        weights = np.where(valid, weights, 0.)
+        total = weights.sum(axis=(-2, -1))
+        values = (np.ma.getdata(corners) * weights).sum(axis=(-2, -1))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.ma.masked_where(total == 0., values / total)
+
+
+def getLocator(lat, lon):
+    """
+    Return a cached GridLocator for the grid, building it on first use
+    """
+    key = gridKey(lat, lon)
+    if key not in _locatorCache:
+        _locatorCache[key] = GridLocator(lat, lon)
+
+    return _locatorCache[key]
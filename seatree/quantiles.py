@@ -0,0 +1,170 @@
+"""
+Created on Sun Oct 18 2026
+
+Streaming per-grid-cell, per-calendar-month percentiles. Series (monthly or
+higher frequency, e.g. hourly hindcasts) are fed in time/latitude chunks;
+small inputs are reduced exactly, large ones with a fixed-range histogram
+sketch per cell and month whose memory does not grow with record length.
+Results use the (percentile, 12, lat, lon) layout of the wave climatologies
+
+PJD 18 Oct 2026     - started
+PJD 18 Oct 2026     - percentileMethod, the method a chunk budget implies
+PJD 18 Oct 2026     - histogram percentiles interpolate order statistics as
+                      np.nanpercentile, within a bin width of it
+
+@author: durack1
+"""
+
+# %% imports
+import numpy as np
+import warnings
+from seatree.climatology import iterChunks
+from seatree.normalize import fillConfig, normalize
+
+# %% function defs
+
+
+class MonthlyQuantileReducer:
+    """
+    Accumulate (time, lat, lon) blocks with their calendar months (1-12)
+    and return percentiles as a masked (nPct, 12, lat, lon) array.
+    method "exact" keeps the values and uses np.nanpercentile; "histogram"
+    bins values into nBins over valueRange and places each order statistic
+    within its bin, so percentiles are within one bin width,
+    (valueRange[1] - valueRange[0]) / nBins, of np.nanpercentile. Values
+    outside valueRange are clamped to the end bins, and results to each
+    cell's observed min/max, so percentiles among them are not bounded
+    """
+
+    def __init__(self, shape, percentiles, method="exact", valueRange=None,
+                 nBins=256):
+        self.shape = tuple(shape)
+        self.nCells = int(np.prod(self.shape))
+        self.percentiles = np.atleast_1d(np.asarray(percentiles, dtype=float))
+        self.method = method
+        if method == "exact":
+            self.blocks = [[] for _ in range(12)]
+        elif method == "histogram":
+            if valueRange is None:
+                raise ValueError(
+                    "MonthlyQuantileReducer: histogram needs valueRange")
+            self.edges = np.linspace(valueRange[0], valueRange[1], nBins + 1)
+            self.nBins = nBins
+            self.counts = np.zeros((12, nBins, self.nCells), dtype=np.uint32)
+            self.vMin = np.full((12, self.nCells), np.inf)
+            self.vMax = np.full((12, self.nCells), -np.inf)
+        else:
+            raise ValueError("MonthlyQuantileReducer: unknown method %s"
+                             % method)
+
+    def add(self, block, months):
+        data = np.ma.filled(np.ma.asarray(block, dtype=np.float64), np.nan)
+        data = data.reshape(data.shape[0], self.nCells)
+        months = np.asarray(months)
+        for month in np.unique(months):
+            values = data[months == month]
+            if self.method == "exact":
+                self.blocks[month - 1].append(values)
+                continue
+            valid = np.isfinite(values)
+            bins = np.clip(np.searchsorted(self.edges, values, side="right") - 1,
+                           0, self.nBins - 1)
+            cells = np.broadcast_to(np.arange(self.nCells), values.shape)
+            flat = bins[valid] * self.nCells + cells[valid]
+            self.counts[month - 1] += np.bincount(
+                flat, minlength=self.nBins * self.nCells).reshape(
+                    self.nBins, self.nCells).astype(np.uint32)
+            # fmin/fmax ignore NaN (masked) values
+            self.vMin[month - 1] = np.fmin(self.vMin[month - 1],
+                                           np.fmin.reduce(values, axis=0))
+            self.vMax[month - 1] = np.fmax(self.vMax[month - 1],
+                                           np.fmax.reduce(values, axis=0))
+
+    def orderStat(self, counts, cum, k):
+        # Estimate of each cell's k-th (0-based) smallest value: its bin
+        # from the cumulative counts, spread evenly within the bin
+        cells = np.arange(self.nCells)
+        ind = np.minimum((cum <= k).sum(axis=0), self.nBins - 1)
+        below = np.where(ind > 0, cum[ind - 1, cells], 0.)
+        inBin = counts[ind, cells]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            frac = np.where(inBin > 0, (k - below + 0.5) / inBin, 0.)
+
+        return self.edges[ind] + frac * (self.edges[ind + 1] -
+                                         self.edges[ind])
+
+    def result(self):
+        out = np.full((self.percentiles.size, 12, self.nCells), np.nan)
+        for month in range(12):
+            if self.method == "exact":
+                if not self.blocks[month]:
+                    continue
+                values = np.concatenate(self.blocks[month])
+                # all-NaN (land) cells warn and return NaN
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", RuntimeWarning)
+                    out[:, month] = np.nanpercentile(
+                        values, self.percentiles, axis=0)
+                continue
+            counts = self.counts[month].astype(np.float64)
+            cum = counts.cumsum(axis=0)
+            total = cum[-1]
+            for count, pct in enumerate(self.percentiles):
+                # np.nanpercentile's linear interpolation between the order
+                # statistics either side of rank pct/100 * (n - 1)
+                rank = pct / 100. * np.maximum(total - 1., 0.)
+                lower = np.floor(rank)
+                value = self.orderStat(counts, cum, lower)
+                value += (rank - lower) * (self.orderStat(
+                    counts, cum, np.minimum(lower + 1., total - 1.)) - value)
+                value = np.clip(value, self.vMin[month], self.vMax[month])
+                out[count, month] = np.where(total > 0, value, np.nan)
+        out = out.reshape((self.percentiles.size, 12) + self.shape)
+
+        return np.ma.masked_invalid(out)
+
+
+def percentileMethod(shape, chunkBytes, method="auto"):
+    """
+    Method streamMonthlyPercentiles uses for a (time, lat, lon) variable:
+    "auto" is "exact" when a latitude row's full record fits in chunkBytes
+    (as it then does for every band), otherwise "histogram"
+    """
+    if method != "auto":
+        return method
+    nTime, nLat, nLon = shape
+    timeSlices = next(iterChunks(nTime, nLat, nLon, chunkBytes))[1]
+
+    return "exact" if len(timeSlices) == 1 else "histogram"
+
+
+def streamMonthlyPercentiles(fileVar, percentiles, chunkBytes,
+                             method="auto", valueRange=None, nBins=256,
+                             instVal=None):
+    """
+    Percentiles per calendar month of a (time, lat, lon) file variable
+    (cdms2 or seatree.backend), read in latitude bands (and time blocks) of
+    at most chunkBytes. method "auto" is exact when a band's full record
+    fits in one chunk, otherwise histogram (valueRange required, results
+    within (valueRange[1] - valueRange[0]) / nBins), see percentileMethod.
+    Fill values and scale come from the file attributes merged with the
+    insts entry instVal. Returns a masked (nPct, 12, lat, lon) array
+    """
+    nTime, nLat, nLon = fileVar.shape
+    fills, scaleFactor, addOffset = fillConfig(fileVar, instVal)
+    months = np.array([comp.month for comp in
+                       fileVar.getTime().asComponentTime()])
+    method = percentileMethod(fileVar.shape, chunkBytes, method)
+    out = np.ma.zeros((len(np.atleast_1d(percentiles)), 12, nLat, nLon),
+                      dtype=np.float32)
+    for latSlice, timeSlices in iterChunks(nTime, nLat, nLon, chunkBytes):
+        reducer = MonthlyQuantileReducer(
+            (latSlice.stop - latSlice.start, nLon), percentiles,
+            method=method, valueRange=valueRange, nBins=nBins)
+        for timeSlice in timeSlices:
+            block = normalize(fileVar[timeSlice, latSlice], fills,
+                              scaleFactor, addOffset)
+            reducer.add(block, months[timeSlice])
+        out[:, :, latSlice] = reducer.result()
+
+    return out
@@ -0,0 +1,318 @@
+"""
+Created on Sun Oct 18 2026
+
+Virtual aggregated datasets over many NetCDF4 files, e.g. the 2208
+m3aq5_<var>_<YYYYMM>01_emn.nc ACCESS-S1 monthly files. The mirror is scanned
+once and every file's variable, time coverage (in common units), chunk
+layout, filters and per-chunk byte offsets are persisted in a JSON
+reference index (in the spirit of kerchunk). openIndexed then returns one
+lazy, time-concatenated, CF-decoded xarray DataArray whose dask chunks read
+only the touched HDF5 chunks straight from disk (zlib/shuffle decoded
+here, other filters fall back to h5py). A cold open is one JSON load
+rather than opening every file's HDF5 metadata
+
+usage: python -m seatree.refindex <mirrorDir> --out access-index.json
+
+PJD 18 Oct 2026     - started
+PJD 18 Oct 2026     - unwritten chunks read as the HDF5 dataset fill value
+
+@author: durack1
+"""
+
+# %% imports
+import argparse
+import cftime
+import dask.array as da
+import glob
+import h5py
+import json
+import netCDF4
+import numpy as np
+import os
+import xarray as xr
+import zlib
+
+# %% function defs
+
+timeUnits = "days since 1900-01-01 00:00:00"
+_skipAttrs = ["_Netcdf4Coordinates", "_Netcdf4Dimid", "DIMENSION_LIST",
+              "REFERENCE_LIST", "CLASS", "NAME", "_nc3_strict"]
+
+
+def _jsonValue(value):
+    # netCDF attribute values as JSON types
+    if isinstance(value, bytes):
+        return value.decode("utf-8", "replace")
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def scanFile(filePath, varNames=None, units=timeUnits):
+    """
+    Index entries for the time-dependent variables of one NetCDF4 file:
+    {var: {dims, shape, dtype, chunks, filters, fillValue, attrs, time,
+    calendar, refs}} where refs maps "i.j.k" chunk grid keys to [offset,
+    size] and fillValue is the HDF5 fill of unwritten chunks
+    """
+    out = {}
+    with netCDF4.Dataset(filePath) as nc, h5py.File(filePath, "r") as h5:
+        timeVar = nc.variables["time"]
+        calendar = getattr(timeVar, "calendar", "standard")
+        dates = cftime.num2date(timeVar[:], timeVar.units, calendar)
+        time = np.atleast_1d(cftime.date2num(dates, units, calendar))
+        for varName, var in nc.variables.items():
+            if var.dimensions[:1] != ("time",) or varName == "time":
+                continue
+            if varNames is not None and varName not in varNames:
+                continue
+            dset = h5[varName]
+            chunks = dset.chunks or dset.shape
+            refs = {}
+            if dset.chunks is None:
+                refs[".".join(["0"] * dset.ndim)] = [
+                    dset.id.get_offset(), dset.id.get_storage_size()]
+            else:
+                for ind in range(dset.id.get_num_chunks()):
+                    info = dset.id.get_chunk_info(ind)
+                    key = ".".join(str(start // size) for start, size in
+                                   zip(info.chunk_offset, chunks))
+                    refs[key] = [info.byte_offset, info.size]
+            filters = {"shuffle": bool(dset.shuffle),
+                       "compression": dset.compression,
+                       "fletcher32": bool(dset.fletcher32)}
+            out[varName] = {
+                "dims": list(var.dimensions), "shape": list(dset.shape),
+                "dtype": dset.dtype.str, "chunks": list(chunks),
+                "filters": filters, "fillValue": _jsonValue(dset.fillvalue),
+                "attrs": {att: _jsonValue(var.getncattr(att))
+                          for att in var.ncattrs() if att not in _skipAttrs},
+                "time": time.tolist(), "calendar": calendar, "refs": refs}
+
+    return out
+
+
+def _coords(filePath, dims):
+    # non-time coordinate values and attributes from one file
+    coords = {}
+    with netCDF4.Dataset(filePath) as nc:
+        for dim in dims:
+            if dim in nc.variables:
+                var = nc.variables[dim]
+                coords[dim] = {"values": np.asarray(var[:]).tolist(),
+                               "attrs": {att: _jsonValue(var.getncattr(att))
+                                         for att in var.ncattrs()
+                                         if att not in _skipAttrs}}
+
+    return coords
+
+
+def buildIndex(filePaths, indexPath, varNames=None):
+    """
+    Scan filePaths into a reference index at indexPath. Files are stored
+    relative to the index directory; entries of an existing index whose
+    file size and mtime are unchanged are reused rather than rescanned
+    """
+    indexDir = os.path.dirname(os.path.abspath(indexPath))
+    previous = {}
+    if os.path.exists(indexPath):
+        with open(indexPath) as fh:
+            for varName, var in json.load(fh)["variables"].items():
+                varMeta = {field: var.get(field) for field in
+                           ["dims", "dtype", "chunks", "fillValue", "attrs",
+                            "calendar", "coords"]}
+                for entry in var["files"]:
+                    previous[(varName, entry["path"])] = dict(varMeta,
+                                                              **entry)
+    variables = {}
+    for filePath in sorted(filePaths):
+        relPath = os.path.relpath(os.path.abspath(filePath), indexDir)
+        stat = os.stat(filePath)
+        cachedVars = [key[0] for key in previous if key[1] == relPath]
+        reuse = cachedVars and all(
+            previous[(varName, relPath)]["size"] == stat.st_size and
+            previous[(varName, relPath)]["mtime"] == stat.st_mtime_ns
+            for varName in cachedVars)
+        if reuse:
+            scanned = {varName: previous[(varName, relPath)]
+                       for varName in cachedVars
+                       if varNames is None or varName in varNames}
+        else:
+            scanned = scanFile(filePath, varNames)
+        for varName, entry in scanned.items():
+            var = variables.setdefault(varName, {
+                "name": varName, "dims": entry["dims"],
+                "dtype": entry["dtype"], "chunks": entry["chunks"],
+                "fillValue": entry.get("fillValue"),
+                "attrs": entry["attrs"], "calendar": entry["calendar"],
+                "timeUnits": timeUnits, "coords": entry.get("coords") or
+                _coords(filePath, entry["dims"][1:]), "files": []})
+            if entry["shape"][1:] != var.get("shape", entry["shape"])[1:]:
+                raise ValueError("buildIndex: %s grid differs in %s"
+                                 % (varName, filePath))
+            var["shape"] = entry["shape"]
+            var["files"].append({
+                "path": relPath, "size": stat.st_size,
+                "mtime": stat.st_mtime_ns, "shape": entry["shape"],
+                "filters": entry["filters"], "time": entry["time"],
+                "refs": entry["refs"]})
+    for var in variables.values():
+        var["files"].sort(key=lambda entry: entry["time"][0])
+        var["shape"] = [sum(entry["shape"][0] for entry in var["files"])] + \
+            var["shape"][1:]
+    tmpPath = indexPath + ".tmp"
+    with open(tmpPath, "w") as fh:
+        json.dump({"version": 1, "variables": variables}, fh)
+    os.replace(tmpPath, indexPath)
+
+    return variables
+
+
+class _RefArray:
+    """
+    Array-like over one indexed variable; __getitem__ (step-1 slices only,
+    as issued by dask.array.from_array) reads and decodes just the HDF5
+    chunks overlapping the request
+    """
+
+    def __init__(self, var, indexDir):
+        self.var = var
+        self.indexDir = indexDir
+        self.shape = tuple(var["shape"])
+        self.dtype = np.dtype(var["dtype"])
+        self.ndim = len(self.shape)
+        self.chunks = var["chunks"]
+        self.fileStart = np.cumsum([0] + [entry["shape"][0]
+                                          for entry in var["files"]])
+
+    def fillValue(self):
+        # what HDF5 returns for unwritten chunks: the dataset fill recorded
+        # at scan time, else (older indexes) _FillValue or the netCDF
+        # default fill for the type
+        fill = self.var.get("fillValue")
+        if fill is None:
+            fill = self.var["attrs"].get("_FillValue")
+        if fill is None:
+            fill = netCDF4.default_fillvals.get(self.dtype.str[1:], 0)
+
+        return fill
+
+    def _chunk(self, entry, fh, key, ind):
+        # decoded chunk (full chunk shape), fill value where unwritten
+        chunkShape = tuple(self.chunks)
+        fill = self.fillValue()
+        if key not in entry["refs"]:
+            return np.full(chunkShape, fill, dtype=self.dtype)
+        offset, size = entry["refs"][key]
+        filters = entry["filters"]
+        if (filters["compression"] not in [None, "gzip"] or
+                filters["fletcher32"]):
+            # filters not decoded here, let HDF5 read the chunk region
+            region = tuple(slice(i * chunk, min((i + 1) * chunk, size))
+                           for i, chunk, size in zip(ind, chunkShape,
+                                                     entry["shape"]))
+            block = np.full(chunkShape, fill, dtype=self.dtype)
+            with h5py.File(fh.name, "r") as h5:
+                block[tuple(slice(0, r.stop - r.start) for r in region)] = \
+                    h5[self.var["name"]][region]
+            return block
+        fh.seek(offset)
+        raw = fh.read(size)
+        if filters["compression"] == "gzip":
+            raw = zlib.decompress(raw)
+        if filters["shuffle"]:
+            itemSize = self.dtype.itemsize
+            raw = np.frombuffer(raw, dtype=np.uint8).reshape(
+                itemSize, -1).T.tobytes()
+
+        return np.frombuffer(raw, dtype=self.dtype).reshape(chunkShape)
+
+    def __getitem__(self, key):
+        key = key if isinstance(key, tuple) else (key,)
+        key = key + (slice(None),) * (self.ndim - len(key))
+        bounds = []
+        for sl, size in zip(key, self.shape):
+            if not isinstance(sl, slice) or sl.step not in (None, 1):
+                raise IndexError("refindex: only step-1 slices are supported")
+            bounds.append(sl.indices(size)[:2])
+        out = np.empty([stop - start for start, stop in bounds],
+                       dtype=self.dtype)
+        t0, t1 = bounds[0]
+        files = self.var["files"]
+        first = np.searchsorted(self.fileStart, t0, side="right") - 1
+        for fileInd in range(first, len(files)):
+            fStart = self.fileStart[fileInd]
+            if fStart >= t1:
+                break
+            entry = files[fileInd]
+            local = [(max(t0, fStart) - fStart,
+                      min(t1, fStart + entry["shape"][0]) - fStart)]
+            local += bounds[1:]
+            ranges = [range(lo // chunk, (hi - 1) // chunk + 1)
+                      for (lo, hi), chunk in zip(local, self.chunks)]
+            with open(os.path.join(self.indexDir, entry["path"]), "rb") as fh:
+                for ind in np.ndindex(*[len(r) for r in ranges]):
+                    chunkInd = [r[i] for r, i in zip(ranges, ind)]
+                    block = self._chunk(entry, fh, ".".join(
+                        str(i) for i in chunkInd), chunkInd)
+                    src, dst = [], []
+                    for axis, (ci, (lo, hi), chunk) in enumerate(
+                            zip(chunkInd, local, self.chunks)):
+                        c0 = ci * chunk
+                        a, b = max(lo, c0), min(hi, c0 + chunk)
+                        src.append(slice(a - c0, b - c0))
+                        # output offset, time is offset by the file start
+                        base = (fStart - t0) if axis == 0 else -bounds[axis][0]
+                        dst.append(slice(a + base, b + base))
+                    out[tuple(dst)] = block[tuple(src)]
+
+        return out
+
+
+def openIndexed(indexPath, varName, decode=True):
+    """
+    Lazy time-concatenated DataArray of varName from a reference index,
+    dask-chunked on the files' native chunks (one file per time chunk).
+    decode applies CF fill/scale decoding and converts time to dates
+    """
+    indexDir = os.path.dirname(os.path.abspath(indexPath))
+    with open(indexPath) as fh:
+        var = json.load(fh)["variables"][varName]
+    array = _RefArray(var, indexDir)
+    fileLens = tuple(entry["shape"][0] for entry in var["files"])
+    chunks = (fileLens,) + tuple(var["chunks"][1:])
+    data = da.from_array(array, chunks=chunks, asarray=False, fancy=False)
+    time = np.concatenate([entry["time"] for entry in var["files"]])
+    coords = {"time": ("time", time, {"units": var["timeUnits"],
+                                      "calendar": var["calendar"]})}
+    for dim, coord in var["coords"].items():
+        coords[dim] = (dim, np.asarray(coord["values"]), coord["attrs"])
+    ds = xr.Dataset({varName: (var["dims"], data, var["attrs"])},
+                    coords=coords)
+    if decode:
+        ds = xr.decode_cf(ds)
+
+    return ds[varName]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Index a mirror of NetCDF4 files for lazy aggregated reads")
+    parser.add_argument("mirrorDir")
+    parser.add_argument("--pattern", default="*.nc")
+    parser.add_argument("--vars", default=None,
+                        help="comma-separated variables (default all)")
+    parser.add_argument("--out", default="index.json")
+    args = parser.parse_args(argv)
+    filePaths = glob.glob(os.path.join(args.mirrorDir, args.pattern))
+    varNames = args.vars.split(",") if args.vars else None
+    variables = buildIndex(filePaths, args.out, varNames)
+    for varName, var in variables.items():
+        print(varName, len(var["files"]), "files", var["shape"])
+    print("index:", args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Created on Sun Oct 18 2026
+
+Area-weighted regional means over lat/lon boxes and polygons. For each grid
+a sparse (region, cell) matrix of fractional cell areas is built once -
+exact sin(lat) x longitude overlaps for boxes, sub-cell point sampling for
+polygons - cached in memory and optionally on disk, then every region,
+month and variable of a (..., lat, lon) stack is reduced in one weighted
+sparse multiply that honours the field mask
+
+PJD 18 Oct 2026     - started
+PJD 18 Oct 2026     - regionMeans reads only the cells regions cover
+
+@author: durack1
+"""
+
+# %% imports
+import hashlib
+import json
+import numpy as np
+import os
+import scipy.sparse as sps
+from seatree.points import gridKey
+from seatree.regrid import applyWeights, cellBounds, overlap1d
+
+# %% function defs
+
+_regionCache = {}
+
+
+def _latBounds(lat):
+    # sin(lat) cell bounds, proportional to cell area per degree longitude
+    return [np.sin(np.deg2rad(np.clip(b, -90., 90.))) for b in cellBounds(lat)]
+
+
+def boxWeights(lat, lon, box):
+    """
+    (nLat * nLon,) cell areas (sin(lat) x degree units) inside a lat0, lat1,
+    lon0, lon1 box; partially covered cells contribute their overlap.
+    Longitudes are compared modulo 360
+    """
+    latLo, latHi = _latBounds(lat)
+    lonLo, lonHi = cellBounds(lon)
+    boxLat = np.sin(np.deg2rad(np.clip(np.asarray(box[:2], dtype=np.float64),
+                                       -90., 90.)))
+    latOv = overlap1d(latLo, latHi, boxLat[:1], boxLat[1:])[0]
+    lonOv = sum(overlap1d(lonLo + shift, lonHi + shift, np.array([box[2]]),
+                          np.array([box[3]]))[0]
+                for shift in (-360., 0., 360.))
+
+    return np.outer(latOv, lonOv).ravel()
+
+
+def polygonWeights(lat, lon, vertices, nSub=8):
+    """
+    (nLat * nLon,) cell areas inside a polygon of (lon, lat) vertices, from
+    the fraction of nSub x nSub points per cell that fall inside it. The
+    polygon is shifted into the grid's longitude convention
+    """
+    from matplotlib.path import Path
+
+    vertices = np.asarray(vertices, dtype=np.float64)
+    gridLon = np.asarray(lon, dtype=np.float64)
+    vertices = np.column_stack([
+        gridLon.min() + np.mod(vertices[:, 0] - gridLon.min(), 360.),
+        vertices[:, 1]])
+    path = Path(vertices)
+    latLo, latHi = cellBounds(lat)
+    lonLo, lonHi = cellBounds(gridLon)
+    latSel = np.nonzero((latHi > vertices[:, 1].min()) &
+                        (latLo < vertices[:, 1].max()))[0]
+    lonSel = np.nonzero((lonHi > vertices[:, 0].min()) &
+                        (lonLo < vertices[:, 0].max()))[0]
+    weights = np.zeros((np.size(lat), gridLon.size))
+    if not (latSel.size and lonSel.size):
+        return weights.ravel()
+    frac = (np.arange(nSub) + 0.5) / nSub
+    subLat = (latLo[latSel, None] + (latHi - latLo)[latSel, None] *
+              frac[None, :]).ravel()
+    subLon = (lonLo[lonSel, None] + (lonHi - lonLo)[lonSel, None] *
+              frac[None, :]).ravel()
+    pLat, pLon = np.meshgrid(subLat, subLon, indexing="ij")
+    inside = path.contains_points(np.column_stack([pLon.ravel(),
+                                                   pLat.ravel()]))
+    cover = inside.reshape(latSel.size, nSub, lonSel.size, nSub).mean(
+        axis=(1, 3))
+    sinLo, sinHi = _latBounds(lat)
+    area = np.outer((sinHi - sinLo)[latSel], (lonHi - lonLo)[lonSel])
+    weights[np.ix_(latSel, lonSel)] = cover * area
+
+    return weights.ravel()
+
+
+def regionWeights(lat, lon, regions, nSub=8, cacheDir=None):
+    """
+    (nRegions, nLat * nLon) sparse area weights for regions, each either a
+    (lat0, lat1, lon0, lon1) box or an (n, 2) array of (lon, lat) polygon
+    vertices. Built once per grid and region set, cached in memory and (if
+    cacheDir is given) on disk as a .npz sparse matrix
+    """
+    spec = json.dumps([np.asarray(region, dtype=np.float64).tolist()
+                       for region in regions])
+    key = hashlib.sha1("_".join([gridKey(lat, lon), spec, str(nSub)]).encode(
+        )).hexdigest()
+    if key in _regionCache:
+        return _regionCache[key]
+    cacheFile = None
+    if cacheDir is not None:
+        cacheFile = os.path.join(cacheDir, "_".join(["regions", key]) + ".npz")
+    if cacheFile is not None and os.path.exists(cacheFile):
+        weights = sps.load_npz(cacheFile).tocsr()
+    else:
+        rows = []
+        for region in regions:
+            region = np.asarray(region, dtype=np.float64)
+            if region.ndim == 1:
+                rows.append(sps.csr_matrix(boxWeights(lat, lon, region)))
+            else:
+                rows.append(sps.csr_matrix(polygonWeights(lat, lon, region,
+                                                          nSub)))
+        weights = sps.vstack(rows, format="csr")
+        weights.eliminate_zeros()
+        if cacheFile is not None:
+            os.makedirs(cacheDir, exist_ok=True)
+            sps.save_npz(cacheFile + ".tmp.npz", weights)
+            os.replace(cacheFile + ".tmp.npz", cacheFile)
+    _regionCache[key] = weights
+
+    return weights
+
+
+def regionMeans(weights, field):
+    """
+    Area-weighted means of a (..., lat, lon) field over every region,
+    returned as a masked (..., nRegions) array. field is masked or plain
+    float with NaN for missing (e.g. a memory-mapped cached grid); only the
+    cells the regions cover are read and checked, masked or NaN cells carry
+    no weight and regions with no valid cells are masked
+    """
+    cols = np.unique(weights.indices)
+    lead = field.shape[:-2]
+    cells = np.ma.masked_invalid(
+        np.ma.asarray(field).reshape(lead + (-1,))[..., cols])
+
+    return applyWeights(weights[:, cols], cells[..., None, :],
+                        (weights.shape[0],), minValid=0.)
@@ -0,0 +1,156 @@
+"""
+Created on Sun Oct 18 2026
+
+Sparse regridding between rectilinear lat/lon grids (e.g. COWCLIP or AGCD
+onto the WOA18 1x1 grid). Conservative (area overlap) or bilinear weights
+are built once per source/target grid pair, cached on disk as scipy sparse
+matrices and applied to a whole (..., lat, lon) stack in one sparse
+matrix multiply, renormalising by each field's valid (unmasked) weight so
+source land masks are honoured
+
+PJD 18 Oct 2026     - started
+PJD 18 Oct 2026     - bilinear weights empty outside regional source grids
+
+@author: durack1
+"""
+
+# %% imports
+import hashlib
+import numpy as np
+import os
+import scipy.sparse as sps
+from seatree.points import GridLocator, gridKey
+
+# %% function defs
+
+_weightCache = {}
+
+
+def cellBounds(centres):
+    """
+    Cell (lower, upper) bounds from centres, using midpoints between
+    neighbours and extrapolating half a cell at each end
+    """
+    centres = np.asarray(centres, dtype=np.float64)
+    order = np.argsort(centres)
+    sortedC = centres[order]
+    edges = np.empty(sortedC.size + 1)
+    edges[1:-1] = 0.5 * (sortedC[1:] + sortedC[:-1])
+    edges[0] = sortedC[0] - 0.5 * (sortedC[1] - sortedC[0])
+    edges[-1] = sortedC[-1] + 0.5 * (sortedC[-1] - sortedC[-2])
+    lower, upper = np.empty(centres.size), np.empty(centres.size)
+    lower[order], upper[order] = edges[:-1], edges[1:]
+
+    return lower, upper
+
+
+def overlap1d(srcLower, srcUpper, dstLower, dstUpper):
+    # Dense (nDst, nSrc) overlap lengths between two sets of intervals
+    return np.clip(np.minimum(dstUpper[:, None], srcUpper[None, :]) -
+                   np.maximum(dstLower[:, None], srcLower[None, :]), 0., None)
+
+
+def conservativeWeights(srcLat, srcLon, dstLat, dstLon):
+    """
+    (nDst, nSrc) sparse matrix of cell overlap areas (in sin(lat) x degree
+    units) between source and target cells; longitudes are periodic
+    """
+    srcLatLo, srcLatHi = [np.sin(np.deg2rad(np.clip(b, -90., 90.)))
+                          for b in cellBounds(srcLat)]
+    dstLatLo, dstLatHi = [np.sin(np.deg2rad(np.clip(b, -90., 90.)))
+                          for b in cellBounds(dstLat)]
+    latOv = overlap1d(srcLatLo, srcLatHi, dstLatLo, dstLatHi)
+    srcLonLo, srcLonHi = cellBounds(srcLon)
+    dstLonLo, dstLonHi = cellBounds(dstLon)
+    # compare against source cells shifted by -360, 0, +360 for periodicity
+    lonOv = sum(overlap1d(srcLonLo + shift, srcLonHi + shift,
+                          dstLonLo, dstLonHi) for shift in (-360., 0., 360.))
+
+    return sps.kron(sps.csr_matrix(latOv), sps.csr_matrix(lonOv),
+                    format="csr")
+
+
+def bilinearWeights(srcLat, srcLon, dstLat, dstLon):
+    """
+    (nDst, nSrc) sparse matrix of bilinear interpolation weights from the
+    four source cells surrounding each target cell centre; targets outside
+    the source grid's cells have empty rows
+    """
+    locator = GridLocator(srcLat, srcLon)
+    nLon = np.size(srcLon)
+    dLat, dLon = np.meshgrid(dstLat, dstLon, indexing="ij")
+    latInds, lonInds, weights = locator.bilinear(dLat.ravel(), dLon.ravel())
+    # targets beyond the source cells (e.g. a regional grid) get no weights
+    # rather than the clamped edge values
+    latLo, latHi = cellBounds(srcLat)
+    inside = (dLat.ravel() >= latLo.min()) & (dLat.ravel() <= latHi.max())
+    if not locator.lon.cyclic:
+        lonLo, lonHi = cellBounds(srcLon)
+        wrapped = lonLo.min() + np.mod(dLon.ravel() - lonLo.min(), 360.)
+        inside &= wrapped <= lonHi.max()
+    weights = weights * inside[:, None, None]
+    cols = latInds[:, :, None] * nLon + lonInds[:, None, :]
+    rows = np.repeat(np.arange(dLat.size), 4)
+    nSrc = np.size(srcLat) * nLon
+
+    return sps.csr_matrix((weights.ravel(), (rows, cols.ravel())),
+                          shape=(dLat.size, nSrc))
+
+
+def regridWeights(srcLat, srcLon, dstLat, dstLon, method="conservative",
+                  cacheDir=None):
+    """
+    Weights for a source/target grid pair, built once and cached in memory
+    and (if cacheDir is given) on disk as a .npz sparse matrix keyed by the
+    method and both grids' coordinate hashes
+    """
+    key = hashlib.sha1("_".join([method, gridKey(srcLat, srcLon),
+                                 gridKey(dstLat, dstLon)]).encode()).hexdigest()
+    if key in _weightCache:
+        return _weightCache[key]
+    cacheFile = None
+    if cacheDir is not None:
+        cacheFile = os.path.join(cacheDir, "_".join(
+            ["regrid", method, key]) + ".npz")
+    if cacheFile is not None and os.path.exists(cacheFile):
+        weights = sps.load_npz(cacheFile).tocsr()
+    else:
+        if method == "conservative":
+            weights = conservativeWeights(srcLat, srcLon, dstLat, dstLon)
+        elif method == "bilinear":
+            weights = bilinearWeights(srcLat, srcLon, dstLat, dstLon)
+        else:
+            raise ValueError("regridWeights: unknown method %s" % method)
+        weights.eliminate_zeros()
+        if cacheFile is not None:
+            os.makedirs(cacheDir, exist_ok=True)
+            sps.save_npz(cacheFile + ".tmp.npz", weights)
+            os.replace(cacheFile + ".tmp.npz", cacheFile)
+    _weightCache[key] = weights
+
+    return weights
+
+
+def applyWeights(weights, field, dstShape, minValid=0.5):
+    """
+    Regrid a masked (..., lat, lon) field to (..., dstShape) with one sparse
+    multiply over every leading slice. Values are renormalised by the valid
+    weight in each target cell; cells where less than minValid of the
+    source weight is unmasked are masked
+    """
+    field = np.ma.asarray(field)
+    lead = field.shape[:-2]
+    nSrc = weights.shape[1]
+    data = np.ma.getdata(field).reshape(-1, nSrc).T
+    valid = ~np.ma.getmaskarray(field).reshape(-1, nSrc).T
+    # numerator and valid weight in a single multiply
+    both = weights @ np.hstack([np.where(valid, data, 0.), valid])
+    nField = data.shape[1]
+    num, den = both[:, :nField], both[:, nField:]
+    total = np.asarray(weights.sum(axis=1))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = num / den
+        bad = (den <= 0.) | (den < minValid * total)
+    out = np.ma.masked_where(bad, out)
+
+    return out.T.reshape(lead + tuple(dstShape))
@@ -0,0 +1,49 @@
+"""
+Created on Sun Oct 18 2026
+
+Fixed-width monthly summary tables (the durack1-{mean,max,min}-NWAustData
+text reports)
+
+PJD 18 Oct 2026     - started, moved from extractWaveClim.py
+PJD 18 Oct 2026     - renderSummary, tables as a view of seatree.results
+
+@author: durack1
+"""
+
+# %% imports
+import os
+from seatree.trace import span
+
+# %% function defs
+
+monthHeader = "Jan, Feb, Mar, Apr, May, Jun, Jul, Aug, Sep, Oct, Nov, Dec"
+
+
+def writeSummary(fileName, stamp, quantity, rows):
+    """
+    Write a summary table. quantity labels the header (e.g. "Mean", "Max ",
+    "Min "); rows are (label, values) pairs where values is a 12-month
+    sequence or None for a row left empty
+    """
+    with span("report", file=os.path.basename(fileName)), \
+            open(fileName, 'w') as logHandle:
+        logHandle.write("".join(["# Paul J. Durack (durack1) ", stamp, "\n"]))
+        logHandle.write("".join(
+            [quantity, " value/quantity,     ", monthHeader, "\n"]))
+        for label, values in rows:
+            if values is None:
+                logHandle.write("".join([label, "\n"]))
+                continue
+            logHandle.write("".join([label, "".join(
+                ["{:6.2f},".format(i) for i in values]), "\n"]))
+
+
+def renderSummary(fileName, stamp, quantity, site, rows, values):
+    """
+    writeSummary for one site from a seatree.results ResultsStore.lookup
+    dict. rows are (label, (source, variable, statistic)) pairs, or
+    (label, None) for a row left empty
+    """
+    writeSummary(fileName, stamp, quantity, [
+        (label, None if key is None else values[(site,) + tuple(key)])
+        for label, key in rows])
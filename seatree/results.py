@@ -0,0 +1,139 @@
+"""
+Created on Sun Oct 18 2026
+
+Columnar results store for the monthly summary values. Rows of (run, site,
+source, variable, statistic, month, value) are buffered and appended as
+Parquet part files (sorted by site so row-group statistics prune reads);
+reads go through pyarrow.dataset with filters pushed down to the files.
+The fixed-width text tables are rendered from the store (see
+seatree.report.renderSummary)
+
+PJD 18 Oct 2026     - started
+
+@author: durack1
+"""
+
+# %% imports
+import numpy as np
+import os
+import pyarrow as pa
+import pyarrow.dataset as pads
+import pyarrow.parquet as pq
+
+# %% function defs
+
+schema = pa.schema([("run", pa.string()), ("site", pa.string()),
+                    ("source", pa.string()), ("variable", pa.string()),
+                    ("statistic", pa.string()), ("month", pa.int8()),
+                    ("value", pa.float64())])
+
+
+def _expression(filters):
+    # field == value, or isin for list/tuple values, all and-ed together
+    expr = None
+    for name, value in filters.items():
+        if isinstance(value, (list, tuple, np.ndarray)):
+            term = pads.field(name).isin(list(value))
+        else:
+            term = pads.field(name) == value
+        expr = term if expr is None else expr & term
+
+    return expr
+
+
+class ResultsStore:
+    """
+    Append-only Parquet dataset in rootDir. append buffers (month, site)
+    blocks and flushes a part file once batchRows rows are held (and on
+    flush/close); read and lookup query every flushed part
+    """
+
+    def __init__(self, rootDir, batchRows=1000000):
+        self.rootDir = rootDir
+        self.batchRows = batchRows
+        self._buffer = []
+        self._nRows = 0
+        self._nParts = 0
+        os.makedirs(rootDir, exist_ok=True)
+
+    def append(self, run, sites, source, variable, statistic, values):
+        """
+        Buffer values, a (12,) or (12, nSites) array (NaN for missing), for
+        the site names in sites
+        """
+        sites = [sites] if isinstance(sites, str) else list(sites)
+        values = np.asarray(values, dtype=np.float64).reshape(12, len(sites))
+        nRows = values.size
+        self._buffer.append(pa.table({
+            "run": pa.array([run] * nRows, pa.string()),
+            "site": pa.array(np.tile(np.asarray(sites, dtype=object), 12),
+                             pa.string()),
+            "source": pa.array([source] * nRows, pa.string()),
+            "variable": pa.array([variable] * nRows, pa.string()),
+            "statistic": pa.array([statistic] * nRows, pa.string()),
+            "month": pa.array(np.repeat(np.arange(1, 13, dtype=np.int8),
+                                        len(sites))),
+            "value": pa.array(values.ravel(), pa.float64())}, schema=schema))
+        self._nRows += nRows
+        if self._nRows >= self.batchRows:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        table = pa.concat_tables(self._buffer).sort_by(
+            [("site", "ascending"), ("source", "ascending"),
+             ("variable", "ascending"), ("month", "ascending")])
+        partPath = os.path.join(self.rootDir, "part-%d-%05d.parquet" %
+                                (os.getpid(), self._nParts))
+        while os.path.exists(partPath):
+            self._nParts += 1
+            partPath = os.path.join(self.rootDir, "part-%d-%05d.parquet" %
+                                    (os.getpid(), self._nParts))
+        # write then rename so readers never see a partial part ("_" files
+        # are ignored by dataset discovery)
+        tmpPath = os.path.join(self.rootDir,
+                               "_" + os.path.basename(partPath) + ".tmp")
+        pq.write_table(table, tmpPath, row_group_size=65536)
+        os.replace(tmpPath, partPath)
+        self._nParts += 1
+        self._buffer = []
+        self._nRows = 0
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def read(self, columns=None, **filters):
+        """
+        pyarrow Table of the flushed rows matching filters (column=value or
+        column=[values]), pushed down to the Parquet scan
+        """
+        dataset = pads.dataset(self.rootDir, format="parquet", schema=schema,
+                               exclude_invalid_files=True)
+
+        return dataset.to_table(columns=columns, filter=_expression(filters))
+
+    def lookup(self, **filters):
+        """
+        {(site, source, variable, statistic): 12-month float array} for the
+        rows matching filters (NaN for months not stored)
+        """
+        table = self.read(columns=["site", "source", "variable", "statistic",
+                                   "month", "value"], **filters)
+        columns = table.to_pydict()
+        out = {}
+        for site, source, variable, statistic, month, value in zip(
+                columns["site"], columns["source"], columns["variable"],
+                columns["statistic"], columns["month"], columns["value"]):
+            key = (site, source, variable, statistic)
+            if key not in out:
+                out[key] = np.full(12, np.nan)
+            out[key][month - 1] = np.nan if value is None else value
+
+        return out
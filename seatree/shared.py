@@ -0,0 +1,155 @@
+"""
+Created on Sun Oct 18 2026
+
+Read-only arrays shared between worker processes. The parent publishes
+static data (target grids, regrid/region weights, masks) once into a
+SharedStore, a directory of .npy files on tmpfs (/dev/shm where available):
+plain arrays, masked arrays (data + mask) and scipy CSR matrices (data,
+indices, indptr). Workers attach to the store by its directory and map each
+array by name with np.load(mmap_mode="r"), so every process reads the same
+physical pages without copying or re-reading the source files, and memory
+per node stays flat as workers are added. The owning process removes the
+store on close, at exit or when it is garbage collected; attached stores
+only drop their maps
+
+PJD 18 Oct 2026     - started
+
+@author: durack1
+"""
+
+# %% imports
+import json
+import numpy as np
+import os
+import re
+import shutil
+import tempfile
+import weakref
+
+# %% function defs
+
+_validName = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+def sharedBaseDir():
+    """
+    tmpfs (/dev/shm) if present and writable, otherwise the temp directory
+    """
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+
+    return tempfile.gettempdir()
+
+
+def _remove(rootDir, ownerPid):
+    # only the creating process removes the store, not forked workers
+    if os.getpid() == ownerPid:
+        shutil.rmtree(rootDir, ignore_errors=True)
+
+
+class SharedStore:
+    """
+    Store of named read-only arrays. SharedStore() creates and owns a new
+    store (in baseDir, default sharedBaseDir()); SharedStore(rootDir)
+    attaches to an existing one, e.g. in a worker given store.rootDir.
+    publish(name, array) writes an array once, store[name] maps it
+    """
+
+    def __init__(self, rootDir=None, baseDir=None):
+        self.owner = rootDir is None
+        if self.owner:
+            rootDir = tempfile.mkdtemp(prefix="seatree-shared-",
+                                       dir=baseDir or sharedBaseDir())
+            self._finalizer = weakref.finalize(self, _remove, rootDir,
+                                               os.getpid())
+        self.rootDir = rootDir
+        self._arrays = {}
+
+    def _path(self, name, part):
+        return os.path.join(self.rootDir, ".".join([name, part]))
+
+    def _write(self, name, part, array):
+        # write then rename so attaching workers never map a partial file
+        filePath = self._path(name, part + ".npy")
+        tmpPath = self._path(name, part + ".tmp.npy")
+        np.save(tmpPath, np.ascontiguousarray(array))
+        os.replace(tmpPath, filePath)
+
+    def publish(self, name, obj):
+        """
+        Write an array, masked array or scipy sparse matrix (stored as CSR)
+        under name and return its read-only shared view
+        """
+        if not self.owner:
+            raise ValueError("SharedStore: attached stores are read only")
+        if not _validName.match(name):
+            raise ValueError("SharedStore: invalid name %s" % name)
+        if name in self:
+            raise KeyError("SharedStore: %s already published" % name)
+        if hasattr(obj, "tocsr"):
+            obj = obj.tocsr()
+            meta = {"kind": "csr", "shape": list(obj.shape)}
+            parts = {"data": obj.data, "indices": obj.indices,
+                     "indptr": obj.indptr}
+        elif np.ma.isMaskedArray(obj):
+            meta = {"kind": "masked"}
+            parts = {"data": np.ma.getdata(obj),
+                     "mask": np.ma.getmaskarray(obj)}
+        else:
+            meta = {"kind": "array"}
+            parts = {"data": np.asarray(obj)}
+        for part, array in parts.items():
+            self._write(name, part, array)
+        metaPath = self._path(name, "json")
+        with open(metaPath + ".tmp", "w") as fh:
+            json.dump(meta, fh)
+        os.replace(metaPath + ".tmp", metaPath)
+
+        return self[name]
+
+    def __contains__(self, name):
+        return os.path.exists(self._path(name, "json"))
+
+    def __getitem__(self, name):
+        if name in self._arrays:
+            return self._arrays[name]
+        if name not in self:
+            raise KeyError("SharedStore: %s not published" % name)
+        with open(self._path(name, "json")) as fh:
+            meta = json.load(fh)
+
+        def part(key):
+            return np.load(self._path(name, key + ".npy"), mmap_mode="r")
+
+        if meta["kind"] == "csr":
+            import scipy.sparse as sps
+
+            obj = sps.csr_matrix((part("data"), part("indices"),
+                                  part("indptr")), shape=meta["shape"],
+                                 copy=False)
+        elif meta["kind"] == "masked":
+            obj = np.ma.MaskedArray(part("data"), mask=part("mask"),
+                                    copy=False)
+        else:
+            obj = part("data")
+        self._arrays[name] = obj
+
+        return obj
+
+    def names(self):
+        return sorted(fileName[:-5] for fileName in os.listdir(self.rootDir)
+                      if fileName.endswith(".json"))
+
+    def close(self):
+        """
+        Drop this process's maps; the owner also removes the store
+        """
+        self._arrays = {}
+        if self.owner:
+            self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,141 @@
+"""
+Created on Sun Oct 18 2026
+
+Site catalogs for multi-site runs. Sites are points (nearest-cell
+sampling) optionally carrying a lat/lon box or polygon (area-weighted mean,
+see seatree.regions), read from CSV (name, lat, lon[, lat0, lat1, lon0,
+lon1]) or GeoJSON (Point or Polygon features). Gridded fields are read once
+and every site is sampled from them
+
+PJD 18 Oct 2026     - started
+PJD 18 Oct 2026     - area-weighted box/polygon means via seatree.regions
+PJD 18 Oct 2026     - sampleGrid takes precomputed (e.g. shared) weights
+PJD 18 Oct 2026     - NaN is missing, only sampled cells are checked
+
+@author: durack1
+"""
+
+# %% imports
+import csv
+import json
+import numpy as np
+import os
+from seatree.points import getLocator
+from seatree.regions import regionMeans, regionWeights
+
+# %% function defs
+
+boxFields = ["lat0", "lat1", "lon0", "lon1"]
+
+
+def siteCatalog(names, lat, lon, boxes=None, polygons=None):
+    """
+    Catalog dict of names, lat and lon arrays, an (n, 4) lat0, lat1, lon0,
+    lon1 box array (NaN rows where there is no box) and a list of (m, 2)
+    (lon, lat) polygon vertex arrays (None where there is no polygon)
+    """
+    lat = np.atleast_1d(np.asarray(lat, dtype=np.float64))
+    lon = np.atleast_1d(np.asarray(lon, dtype=np.float64))
+    if boxes is None:
+        boxes = np.full((lat.size, 4), np.nan)
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(lat.size, 4)
+    if polygons is None:
+        polygons = [None] * lat.size
+
+    return {"name": list(names), "lat": lat, "lon": lon, "box": boxes,
+            "polygon": list(polygons)}
+
+
+def siteRegions(sites):
+    """
+    Indices of the sites with a polygon or box and their regions, as used
+    by seatree.regions.regionWeights
+    """
+    inds, regions = [], []
+    for count, (box, polygon) in enumerate(zip(sites["box"],
+                                               sites["polygon"])):
+        if polygon is not None:
+            regions.append(polygon)
+        elif not np.isnan(box).any():
+            regions.append(box)
+        else:
+            continue
+        inds.append(count)
+
+    return inds, regions
+
+
+def _readCsv(filePath):
+    names, lat, lon, boxes = [], [], [], []
+    with open(filePath, newline="") as fh:
+        for row in csv.DictReader(fh):
+            names.append(row["name"].strip())
+            lat.append(float(row["lat"]))
+            lon.append(float(row["lon"]))
+            boxes.append([float(row[field]) if row.get(field, "").strip()
+                          else np.nan for field in boxFields])
+
+    return siteCatalog(names, lat, lon, boxes)
+
+
+def _readGeoJson(filePath):
+    with open(filePath) as fh:
+        collection = json.load(fh)
+    names, lat, lon, boxes, polygons = [], [], [], [], []
+    for count, feature in enumerate(collection["features"]):
+        geometry = feature["geometry"]
+        properties = feature.get("properties") or {}
+        names.append(str(properties.get("name", "site%03d" % count)))
+        if geometry["type"] == "Point":
+            lon.append(geometry["coordinates"][0])
+            lat.append(geometry["coordinates"][1])
+            boxes.append([np.nan] * 4)
+            polygons.append(None)
+        elif geometry["type"] == "Polygon":
+            # outer ring only, the site point is the centre of its bounds
+            ring = np.asarray(geometry["coordinates"][0], dtype=np.float64)
+            box = [ring[:, 1].min(), ring[:, 1].max(),
+                   ring[:, 0].min(), ring[:, 0].max()]
+            lat.append(0.5 * (box[0] + box[1]))
+            lon.append(0.5 * (box[2] + box[3]))
+            boxes.append(box)
+            polygons.append(ring)
+        else:
+            raise ValueError("loadSites: unsupported geometry %s"
+                             % geometry["type"])
+
+    return siteCatalog(names, lat, lon, boxes, polygons)
+
+
+def loadSites(filePath):
+    """
+    Read a .csv or .geojson/.json site catalog
+    """
+    ext = os.path.splitext(filePath)[1].lower()
+    if ext == ".csv":
+        return _readCsv(filePath)
+    elif ext in [".geojson", ".json"]:
+        return _readGeoJson(filePath)
+    raise ValueError("loadSites: unknown catalog format %s" % filePath)
+
+
+def sampleGrid(field, lat, lon, sites, cacheDir=None, weights=None):
+    """
+    Sample a (..., lat, lon) field, masked or NaN where missing (e.g. a
+    memory-mapped cached grid), at every site: the area-weighted mean of
+    the valid cells in the site polygon or box, or the nearest cell for
+    point-only sites. Only the sampled cells are read. Region weights are
+    built once per grid (and cached in cacheDir if given) unless weights,
+    the regionWeights of the siteRegions, are passed in. Returns a masked
+    (..., nSites) array
+    """
+    field = np.ma.asarray(field)
+    latInd, lonInd = getLocator(lat, lon).nearest(sites["lat"], sites["lon"])
+    out = np.ma.masked_invalid(field[..., latInd, lonInd])
+    inds, regions = siteRegions(sites)
+    if inds:
+        if weights is None:
+            weights = regionWeights(lat, lon, regions, cacheDir=cacheDir)
+        out[..., inds] = regionMeans(weights, field)
+
+    return out
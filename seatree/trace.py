@@ -0,0 +1,162 @@
+"""
+Created on Sun Oct 18 2026
+
+Stage-level timing and memory instrumentation. Pipeline stages (open, read,
+mask/scale, climatology, write, extract, ASCII ingest, report, ...) are
+wrapped in spans which record wall and CPU time, bytes read (/proc/self/io
+rchar, process wide so concurrent threads are included), tracemalloc peak
+above the span's starting allocation and process RSS, tagged by e.g.
+institution and variable. Spans nest and inherit their parent's tags.
+Records are written as JSON lines and summarised in a fixed-width table.
+Spans are no-ops until the tracer is started
+
+PJD 18 Oct 2026     - started
+
+@author: durack1
+"""
+
+# %% imports
+import contextlib
+import json
+import os
+import resource
+import time
+import tracemalloc
+
+# %% function defs
+
+MB = 1024.**2
+
+
+def _readChars():
+    # bytes read by read(2)-family calls, including page cache hits
+    try:
+        with open("/proc/self/io") as fh:
+            for line in fh:
+                if line.startswith("rchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _rss():
+    # current resident set size in bytes
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+class Tracer:
+    """
+    Collects span records. start(memory=True) enables tracing (memory
+    additionally starts tracemalloc, which slows allocation-heavy code);
+    span(stage, **tags) is a context manager yielding the record dict so
+    callers can add fields (e.g. nBytes) before it closes
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self.records = []
+        self._stack = []
+
+    def start(self, memory=True):
+        self.enabled = True
+        self.memory = memory
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stop(self):
+        self.enabled = False
+        if self.memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.memory = False
+
+    @contextlib.contextmanager
+    def span(self, stage, **tags):
+        if not self.enabled:
+            yield {}
+            return
+        parent = self._stack[-1] if self._stack else None
+        record = dict(parent["tags"]) if parent else {}
+        record.update(tags)
+        frame = {"tags": dict(record), "childPeak": 0}
+        record = {"stage": stage, **record}
+        if self.memory:
+            traced, peak = tracemalloc.get_traced_memory()
+            frame["traced"] = traced
+            if parent is not None:
+                parent["childPeak"] = max(parent["childPeak"], peak)
+            tracemalloc.reset_peak()
+        self._stack.append(frame)
+        readStart = _readChars()
+        cpuStart = time.process_time()
+        record["start"] = time.time()
+        wallStart = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - wallStart
+            record["cpuSeconds"] = time.process_time() - cpuStart
+            readEnd = _readChars()
+            if readStart is not None and readEnd is not None:
+                record["readMB"] = (readEnd - readStart) / MB
+            self._stack.pop()
+            if self.memory:
+                peak = max(tracemalloc.get_traced_memory()[1],
+                           frame["childPeak"])
+                record["peakMB"] = (peak - frame["traced"]) / MB
+                if parent is not None:
+                    parent["childPeak"] = max(parent["childPeak"], peak)
+            rss = _rss()
+            if rss is not None:
+                record["rssMB"] = rss / MB
+            # ru_maxrss is in KiB on Linux
+            record["maxRssMB"] = resource.getrusage(
+                resource.RUSAGE_SELF).ru_maxrss / 1024.
+            record["depth"] = len(self._stack)
+            record["pid"] = os.getpid()
+            self.records.append(record)
+
+    def write(self, filePath):
+        # one JSON record per line, in completion order
+        with open(filePath, "w") as fh:
+            for record in self.records:
+                fh.write(json.dumps(record, default=str) + "\n")
+
+    def summary(self, by=("stage", "inst")):
+        """
+        Fixed-width table of span count, total wall/CPU seconds, MB read and
+        maximum tracemalloc peak and RSS, grouped by the by fields
+        """
+        groups = {}
+        for record in self.records:
+            key = tuple(str(record.get(field, "")) for field in by)
+            group = groups.setdefault(key, {"n": 0, "seconds": 0.,
+                                            "cpuSeconds": 0., "readMB": 0.,
+                                            "peakMB": 0., "maxRssMB": 0.})
+            group["n"] += 1
+            group["seconds"] += record["seconds"]
+            group["cpuSeconds"] += record["cpuSeconds"]
+            group["readMB"] += record.get("readMB", 0.)
+            for field in ["peakMB", "maxRssMB"]:
+                group[field] = max(group[field], record.get(field, 0.))
+        lines = ["".join(["{:<14s}".format(field) for field in by]) +
+                 "     n    wall s     cpu s   read MB   peak MB    RSS MB"]
+        for key, group in sorted(groups.items(),
+                                 key=lambda item: -item[1]["seconds"]):
+            lines.append("".join(["{:<14s}".format(field[:13]) for field in key]) +
+                         "{:6d}{:10.3f}{:10.3f}{:10.1f}{:10.1f}{:10.1f}".format(
+                             group["n"], group["seconds"], group["cpuSeconds"],
+                             group["readMB"], group["peakMB"],
+                             group["maxRssMB"]))
+
+        return "\n".join(lines)
+
+
+# process-wide tracer, forked workers inherit it (see seatree.parallel)
+tracer = Tracer()
+span = tracer.span
@@ -0,0 +1,119 @@
+"""
+Created on Sun Oct 18 2026
+
+Vertical sections along arbitrary polylines. Waypoint polylines are
+resampled at a fixed spacing, then every section requested is sampled from
+an xarray/xcdat (dask-backed) variable with one vectorized bilinear
+interpolation; only the lat/lon box around the sections and the requested
+depth range are read from disk
+
+PJD 18 Oct 2026     - started
+PJD 18 Oct 2026     - sections take the short way across the dateline
+PJD 18 Oct 2026     - subset box padded by the grid spacing, not 1 degree
+
+@author: durack1
+"""
+
+# %% imports
+import numpy as np
+import xarray as xr
+
+# %% function defs
+
+
+def transectPoints(waypoints, spacing=0.25):
+    """
+    Resample a polyline of (lat, lon) waypoints at approximately spacing
+    degrees, keeping every waypoint. Each segment takes the shorter way in
+    longitude (e.g. across the dateline), so returned longitudes are
+    continuous (not wrapped). Returns lat, lon and along-section
+    distance (km, great circle) arrays
+    """
+    waypoints = np.asarray(waypoints, dtype=np.float64)
+    lats, lons = [waypoints[0, 0:1]], [waypoints[0, 1:2]]
+    lon0 = waypoints[0, 1]
+    for (lat0, _), (lat1, lon1) in zip(waypoints[:-1], waypoints[1:]):
+        # longitude step unwrapped into (-180, 180], from the unwrapped
+        # previous waypoint
+        dLon = 180. - np.mod(180. - (lon1 - lon0), 360.)
+        nStep = max(1, int(np.ceil(np.hypot(lat1 - lat0, dLon) /
+                                   spacing - 1e-9)))
+        frac = np.arange(1, nStep + 1) / nStep
+        lats.append(lat0 + frac * (lat1 - lat0))
+        lons.append(lon0 + frac * dLon)
+        lon0 = lon0 + dLon
+    lat, lon = np.concatenate(lats), np.concatenate(lons)
+    # haversine distance between consecutive points
+    phi, lam = np.deg2rad(lat), np.deg2rad(lon)
+    hav = (np.sin(np.diff(phi) / 2.)**2 + np.cos(phi[:-1]) * np.cos(phi[1:]) *
+           np.sin(np.diff(lam) / 2.)**2)
+    step = 2. * 6371. * np.arcsin(np.sqrt(hav))
+
+    return lat, lon, np.concatenate([[0.], np.cumsum(step)])
+
+
+def sampleTransects(da, sections, depthRange=None, spacing=0.25,
+                    latName="lat", lonName="lon", depthName="depth"):
+    """
+    Sample da (e.g. t_an with dims time, depth, lat, lon) along each section
+    (a list of (lat, lon) waypoint polylines). All sections are
+    interpolated together in a single bilinear da.interp call. Returns a
+    list of DataArrays with a "point" dimension carrying lat, lon and
+    distance (km) coordinates
+    """
+    if depthRange is not None:
+        da = da.sel({depthName: slice(*depthRange)})
+    points = [transectPoints(section, spacing) for section in sections]
+    lat = np.concatenate([point[0] for point in points])
+    lon = np.concatenate([point[1] for point in points])
+    # match the dataset longitude convention
+    gridLon = da[lonName].values
+    lon = gridLon.min() + np.mod(lon - gridLon.min(), 360.)
+    # on a global grid, points between the last column and the first + 360
+    # (across the seam) interpolate against a cyclic copy of the first
+    # column
+    lonStep = np.median(np.diff(gridLon))
+    if (lon.max() > gridLon.max() and
+            gridLon.max() - gridLon.min() + lonStep >= 360. - 1e-6):
+        da = xr.concat([da, da.isel({lonName: [0]}).assign_coords(
+            {lonName: gridLon[:1] + 360.})], dim=lonName)
+        gridLon = da[lonName].values
+    # subset to the box around all sections, padded by a grid spacing so
+    # the bracketing rows/columns are kept on any resolution, so only those
+    # chunks are read
+    latGrid = da[latName].values
+    latPad = np.abs(np.diff(latGrid)).max() if latGrid.size > 1 else 0.
+    lonPad = np.abs(np.diff(gridLon)).max() if gridLon.size > 1 else 0.
+    latSel = np.nonzero((latGrid >= lat.min() - latPad) &
+                        (latGrid <= lat.max() + latPad))[0]
+    lonSel = np.nonzero((gridLon >= lon.min() - lonPad) &
+                        (gridLon <= lon.max() + lonPad))[0]
+    da = da.isel({latName: slice(latSel.min(), latSel.max() + 1),
+                  lonName: slice(lonSel.min(), lonSel.max() + 1)})
+    sampled = da.interp({latName: xr.DataArray(lat, dims="point"),
+                         lonName: xr.DataArray(lon, dims="point")},
+                        method="linear")
+    out = []
+    start = 0
+    for point in points:
+        stop = start + point[0].size
+        out.append(sampled.isel(point=slice(start, stop)).assign_coords(
+            distance=("point", point[2])))
+        start = stop
+
+    return out
+
+
+def openMonthly(filePaths, varName, chunks=None, concatDim="time"):
+    """
+    Lazily open a set of (e.g. 12 monthly WOA18) files as one dask-backed
+    DataArray concatenated along concatDim
+    """
+    if chunks is None:
+        chunks = {}
+    ds = xr.open_mfdataset(filePaths, combine="nested", concat_dim=concatDim,
+                           decode_times=False, chunks=chunks,
+                           data_vars="minimal", coords="minimal",
+                           compat="override")
+
+    return ds[varName]
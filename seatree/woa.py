@@ -0,0 +1,67 @@
+"""
+Created on Sun Oct 18 2026
+
+World Ocean Atlas 2018 profile extraction. Lat/lon/depth indices are found
+once from the first monthly file and only the needed depth range of each
+site column is read from every file, returning a (file, depth, site) array
+
+PJD 18 Oct 2026     - started
+PJD 18 Oct 2026     - files opened via seatree.backend
+
+@author: durack1
+"""
+
+# %% imports
+import numpy as np
+import os
+from seatree.backend import getBackend
+from seatree.extract import readSites
+from seatree.points import getLocator
+from seatree.trace import span
+
+# %% function defs
+
+
+def depthIndices(levels, depths):
+    """
+    Indices of the levels nearest each requested depth
+    """
+    levels = np.asarray(levels, dtype=np.float64)
+    depths = np.atleast_1d(np.asarray(depths, dtype=np.float64))
+
+    return np.abs(levels[None, :] - depths[:, None]).argmin(axis=1)
+
+
+def extractWoaProfiles(filePaths, varName, siteLat, siteLon, depths=None,
+                       backend=None):
+    """
+    Read varName (e.g. t_an) profiles at many sites from each WOA18 file
+    (e.g. the 12 monthly woa18_decav_tMM_04.nc). depths selects levels
+    (nearest match), None returns the full profile. Files are read through
+    backend (a seatree.backend name or instance). Returns a masked
+    (nFiles, nDepth, nSites) array and the selected level values
+    """
+    backend = getBackend(backend)
+    out = []
+    for count, filePath in enumerate(filePaths):
+        with span("woa", var=varName, file=os.path.basename(filePath)):
+            fh = backend.open(filePath)
+            fileVar = fh[varName]
+            if count == 0:
+                # all monthly files share the grid, index once
+                levels = fileVar.getLevel()[:]
+                locator = getLocator(fileVar.getLatitude()[:],
+                                     fileVar.getLongitude()[:])
+                latInd, lonInd = locator.nearest(siteLat, siteLon)
+                if depths is None:
+                    depthInd = np.arange(levels.size)
+                else:
+                    depthInd = depthIndices(levels, depths)
+                d0, d1 = int(depthInd.min()), int(depthInd.max()) + 1
+            # (time=1, depth range, site) hyperslab for the site columns only
+            columns = readSites(fileVar, latInd, lonInd,
+                                lead=(slice(0, 1), slice(d0, d1)))
+            out.append(columns[0, depthInd - d0])
+            fh.close()
+
+    return np.ma.stack(out), levels[depthInd]
@@ -0,0 +1,162 @@
+"""
+Created on Sun Oct 18 2026
+
+seatree.fetch against a local, Range-capable HTTP server: resume of a
+partial download, a .part already holding the whole file (416), 404,
+skipping verified files and refetching on a SHA-256 mismatch
+
+usage: python -m unittest discover tests (or python -m pytest tests)
+
+PJD 18 Oct 2026     - started
+
+@author: durack1
+"""
+
+# %% imports
+import hashlib
+import http.server
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+import urllib.error
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seatree.fetch import fetchFile, fetchManifest  # noqa: E402
+
+# %% function defs
+
+payloads = {"/hs.nc": os.urandom(300000), "/tm.nc": os.urandom(1000)}
+
+
+class RangeHandler(http.server.BaseHTTPRequestHandler):
+    # serves payloads, honouring "Range: bytes=N-" as 206 or 416, and logs
+    # (path, Range header) of every request in server.requests
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("Range")))
+        if self.path not in payloads:
+            self.send_error(404)
+            return
+        body = payloads[self.path]
+        match = re.match(r"bytes=(\d+)-$", self.headers.get("Range", ""))
+        if match:
+            start = int(match.group(1))
+            if start >= len(body):
+                self.send_response(416)
+                self.send_header("Content-Range", "bytes */%d" % len(body))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", "bytes %d-%d/%d"
+                             % (start, len(body) - 1, len(body)))
+            body = body[start:]
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FetchTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0),
+                                                     RangeHandler)
+        cls.server.requests = []
+        cls.thread = threading.Thread(target=cls.server.serve_forever,
+                                      daemon=True)
+        cls.thread.start()
+        cls.baseUrl = "http://127.0.0.1:%d" % cls.server.server_address[1]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.destDir = tempfile.mkdtemp()
+        self.server.requests.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.destDir)
+
+    def entry(self, name, **extra):
+        return dict({"url": self.baseUrl + "/" + name, "path": name}, **extra)
+
+    def read(self, name):
+        with open(os.path.join(self.destDir, name), "rb") as fh:
+            return fh.read()
+
+    def writePart(self, name, data):
+        with open(os.path.join(self.destDir, name + ".part"), "wb") as fh:
+            fh.write(data)
+
+    def testRangeResume(self):
+        body = payloads["/hs.nc"]
+        self.writePart("hs.nc", body[:123456])
+        status, info = fetchFile(self.entry("hs.nc", size=len(body)),
+                                 self.destDir, {})
+        self.assertEqual(status, "fetched")
+        self.assertEqual(self.read("hs.nc"), body)
+        self.assertEqual(info["sha256"], hashlib.sha256(body).hexdigest())
+        self.assertEqual(self.server.requests, [("/hs.nc", "bytes=123456-")])
+        self.assertFalse(os.path.exists(
+            os.path.join(self.destDir, "hs.nc.part")))
+
+    def testCompletePart(self):
+        # the server answers 416 and the .part is verified and moved
+        body = payloads["/tm.nc"]
+        self.writePart("tm.nc", body)
+        status, _ = fetchFile(self.entry("tm.nc", size=len(body)),
+                              self.destDir, {})
+        self.assertEqual(status, "fetched")
+        self.assertEqual(self.read("tm.nc"), body)
+
+    def testNotFound(self):
+        with self.assertRaises(urllib.error.HTTPError) as err:
+            fetchFile(self.entry("dir.nc"), self.destDir, {})
+        self.assertEqual(err.exception.code, 404)
+        self.assertEqual(len(self.server.requests), 1)  # not retried
+        results = fetchManifest([self.entry("dir.nc")], self.destDir)
+        self.assertTrue(results["dir.nc"].startswith("failed"))
+
+    def testSkip(self):
+        manifest = [self.entry("hs.nc"), self.entry("tm.nc")]
+        results = fetchManifest(manifest, self.destDir)
+        self.assertEqual(set(results.values()), {"fetched"})
+        self.server.requests.clear()
+        results = fetchManifest(manifest, self.destDir)
+        self.assertEqual(set(results.values()), {"skipped"})
+        self.assertEqual(self.server.requests, [])
+
+    def testChecksumMismatch(self):
+        body = payloads["/tm.nc"]
+        sha = hashlib.sha256(body).hexdigest()
+        # a same-size corrupt local copy is refetched
+        with open(os.path.join(self.destDir, "tm.nc"), "wb") as fh:
+            fh.write(bytes(len(body)))
+        status, _ = fetchFile(self.entry("tm.nc", size=len(body), sha256=sha),
+                              self.destDir, {})
+        self.assertEqual(status, "fetched")
+        self.assertEqual(self.read("tm.nc"), body)
+        # a download that never matches fails after its retries, leaving
+        # nothing behind
+        self.server.requests.clear()
+        with self.assertRaises(IOError):
+            fetchFile(self.entry("hs.nc", sha256="0" * 64), self.destDir, {},
+                      retries=2)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(sorted(os.listdir(self.destDir)), ["tm.nc"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Created on Sun Oct 18 2026
+
+seatree.transect.sampleTransects on grids coarser than a degree: sections
+lying between grid rows/columns, and across the seam of a global grid, are
+interpolated from their bracketing cells
+
+usage: python -m unittest discover tests (or python -m pytest tests)
+
+PJD 18 Oct 2026     - started
+
+@author: durack1
+"""
+
+# %% imports
+import numpy as np
+import os
+import sys
+import unittest
+import xarray as xr
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seatree.transect import sampleTransects  # noqa: E402
+
+# %% function defs
+
+
+def coarseField(lat, lon):
+    # (depth, lat, lon) field linear in lat and lon, so bilinear
+    # interpolation is exact
+    depth = np.array([0., 10.])
+    values = (depth[:, None, None] + 2. * lat[None, :, None] +
+              0.5 * lon[None, None, :])
+
+    return xr.DataArray(values, dims=("depth", "lat", "lon"),
+                        coords={"depth": depth, "lat": lat, "lon": lon})
+
+
+class TransectTest(unittest.TestCase):
+
+    def testBetweenRows(self):
+        # a 5 degree grid, the section runs along 2.5N between rows 0 and 5
+        da = coarseField(np.arange(-20., 21., 5.), np.arange(0., 41., 5.))
+        section, = sampleTransects(da, [[(2.5, 11.), (2.5, 19.)]],
+                                   spacing=1.)
+        expected = (da["depth"].values[:, None] + 2. * section["lat"].values +
+                    0.5 * section["lon"].values)
+        np.testing.assert_allclose(section.values, expected)
+        np.testing.assert_allclose(section["lat"].values, 2.5)
+
+    def testAcrossSeam(self):
+        # 357.5E lies between the last column and the first + 360
+        da = coarseField(np.arange(-20., 21., 5.), np.arange(0., 360., 5.))
+        da = da.copy(data=da.values - 0.5 * da["lon"].values)
+        section, = sampleTransects(da, [[(-7.5, 355.5), (-7.5, 2.)]],
+                                   spacing=1.)
+        self.assertTrue(np.isfinite(section.values).all())
+        expected = da["depth"].values[:, None] + 2. * section["lat"].values
+        np.testing.assert_allclose(section.values, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()